@@ -10,7 +10,7 @@ import shutil
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.detection import PotholeDetector
+from utils.detection import get_detector
 from utils.data_processing import prepare_batch_results, DATABASE_AVAILABLE
 from utils.tutorial import get_tutorial_manager
 
@@ -35,10 +35,6 @@ st.title("🔄 Batch Processing")
 st.markdown("Process multiple images at once to detect potholes.")
 
 # Initialize detector
-@st.cache_resource
-def get_detector():
-    return PotholeDetector()
-
 detector = get_detector()
 
 # Create tabs for different batch operations
@@ -8,7 +8,7 @@ import plotly.graph_objects as go
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.database import get_all_detections, get_detection_statistics, create_tables
+from utils.database import get_all_detections, get_detection_statistics, ensure_schema
 from utils.visualization import create_detection_summary_chart
 from utils.tutorial import get_tutorial_manager
 
@@ -29,7 +29,7 @@ st.title("🗄️ Database Management")
 st.markdown("View and manage detection records stored in the database.")
 
 # Initialize the database if needed
-create_tables()
+ensure_schema()
 
 # Create tabs for different views
 tab1, tab2 = st.tabs(["Records", "Statistics"])
@@ -42,20 +42,37 @@ with tab1:
         detections = get_all_detections()
         if detections:
             # Convert to DataFrame for display
-            df_detections = pd.DataFrame([
-                {
-                    'ID': d['id'],
-                    'Image': d['filename'],
-                    'Class': d['class_name'],
-                    'Confidence': f"{d['confidence']:.2f}",
-                    'Position': f"({d['bbox'][0]}, {d['bbox'][1]}, {d['bbox'][2]}, {d['bbox'][3]})",
-                    'Date': d['detection_date'].strftime('%Y-%m-%d %H:%M:%S') if hasattr(d['detection_date'], 'strftime') else str(d['detection_date'])
-                }
-                for d in detections
-            ])
-            
+            # Keep numeric columns numeric so Arrow ships compact typed columns
+            bboxes = [d['bbox'] for d in detections]
+            df_detections = pd.DataFrame({
+                'ID': [d['id'] for d in detections],
+                'Image': [d['filename'] for d in detections],
+                'Class': [d['class_name'] for d in detections],
+                'Confidence': [d['confidence'] for d in detections],
+                'X1': [b[0] for b in bboxes],
+                'Y1': [b[1] for b in bboxes],
+                'X2': [b[2] for b in bboxes],
+                'Y2': [b[3] for b in bboxes],
+                'Date': pd.to_datetime([d['detection_date'] for d in detections], errors='coerce')
+            }).astype({
+                'ID': 'int32',
+                'Confidence': 'float32',
+                # Bounding box columns are nullable, so keep missing values as <NA>
+                'X1': 'Int32',
+                'Y1': 'Int32',
+                'X2': 'Int32',
+                'Y2': 'Int32'
+            })
+
             # Display the DataFrame
-            st.dataframe(df_detections, use_container_width=True)
+            st.dataframe(
+                df_detections,
+                column_config={
+                    'Confidence': st.column_config.NumberColumn(format='%.2f'),
+                    'Date': st.column_config.DatetimeColumn(format='YYYY-MM-DD HH:mm:ss')
+                },
+                use_container_width=True
+            )
             
             # Show summary
             st.info(f"Total records: {len(detections)}")
@@ -165,8 +182,8 @@ st.subheader("Database Information")
 
 try:
     # Determine which database we're using
-    from utils.database import engine
-    db_type = engine.url.drivername
+    from utils.database import get_engine
+    db_type = get_engine().url.drivername
     
     if 'sqlite' in db_type:
         st.info("Using SQLite database (local storage)")
@@ -31,10 +31,26 @@ if tutorial_manager.is_active():
 st.title("🖼️ Detection Gallery")
 st.markdown("View previously processed images with pothole detections.")
 
+def cache_confidence_stats(result):
+    """Stash derived detection scalars on a result so sorting and metrics are O(1)."""
+    detections = result.get('detections', ())
+    result['_n'] = len(detections)
+    if detections:
+        confidences = np.fromiter((d.get('confidence', 0) for d in detections), dtype=np.float32, count=len(detections))
+        result['_avg_conf'] = float(confidences.mean())
+        result['_max_conf'] = float(confidences.max())
+    else:
+        result['_avg_conf'] = 0.0
+        result['_max_conf'] = 0.0
+    return result
+
 # Load detection results
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_results():
-    return load_detection_results()
+    results = load_detection_results()
+    for r in results:
+        cache_confidence_stats(r)
+    return results
 
 results = load_results()
 
@@ -113,6 +129,11 @@ filtered_results = filter_results(
     min_detections=min_detections
 )
 
+# Confidence filtering replaces the detections list, so refresh the cached stats
+if min_confidence > 0:
+    for r in filtered_results:
+        cache_confidence_stats(r)
+
 if not filtered_results:
     st.warning("No results match the selected filters. Try adjusting your filter criteria.")
     st.stop()
@@ -130,16 +151,10 @@ if sort_option == "Newest First":
 elif sort_option == "Oldest First":
     filtered_results.sort(key=lambda x: x.get('timestamp', 0))
 elif sort_option == "Most Detections":
-    filtered_results.sort(key=lambda x: len(x.get('detections', [])), reverse=True)
+    filtered_results.sort(key=lambda x: x['_n'], reverse=True)
 elif sort_option == "Highest Confidence":
     # Sort by average confidence
-    def avg_confidence(result):
-        detections = result.get('detections', [])
-        if not detections:
-            return 0
-        return sum(d.get('confidence', 0) for d in detections) / len(detections)
-    
-    filtered_results.sort(key=avg_confidence, reverse=True)
+    filtered_results.sort(key=lambda x: x['_avg_conf'], reverse=True)
 
 # Display the gallery
 st.subheader(f"Gallery ({len(filtered_results)} images)")
@@ -229,15 +244,16 @@ with tab2:
             
             # Display metadata
             col1, col2, col3 = st.columns(3)
+            if '_n' not in result:
+                cache_confidence_stats(result)
+
             with col1:
-                st.metric("Detections", len(result.get('detections', [])))
+                st.metric("Detections", result['_n'])
             
             with col2:
-                # Calculate average confidence
-                detections = result.get('detections', [])
-                if detections:
-                    avg_conf = sum(d.get('confidence', 0) for d in detections) / len(detections)
-                    st.metric("Avg. Confidence", f"{avg_conf:.2f}")
+                # Average confidence is precomputed at load time
+                if result['_n']:
+                    st.metric("Avg. Confidence", f"{result['_avg_conf']:.2f}")
                 else:
                     st.metric("Avg. Confidence", "N/A")
             
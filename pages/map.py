@@ -6,17 +6,16 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import random
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.data_processing import load_detection_results, DATABASE_AVAILABLE
-from utils.visualization import create_pothole_map
+from utils.data_processing import load_detection_results, label_hotspots, DATABASE_AVAILABLE
+from utils.visualization import get_map_points, create_map_from_points, MAP_CLUSTER_THRESHOLD
 from utils.tutorial import get_tutorial_manager
 
 # Try to import database functions if available
 if DATABASE_AVAILABLE:
-    from utils.database import get_map_data
+    from utils.database import get_map_data, get_map_clusters
 
 st.set_page_config(
     page_title="Map View - Pothole Detection System",
@@ -35,23 +34,46 @@ st.title("🗺️ Pothole Map Visualization")
 st.markdown("View geographical distribution of detected potholes.")
 
 # Load detection results
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+# Shared across reruns without copying, so callers must not mutate the returned results
+@st.cache_resource(ttl=300)  # Cache for 5 minutes
 def get_results():
+    """Load the map results, returning (results, source, database error or None)."""
+    db_error = None
     # Try to use database first if available
     if DATABASE_AVAILABLE:
         try:
             db_map_data = get_map_data()
             if db_map_data:
-                st.sidebar.success("Using database map data")
-                return db_map_data
+                return db_map_data, "database", None
         except Exception as e:
-            st.sidebar.warning(f"Database error: {e}")
+            db_error = str(e)
     
     # Fallback to file-based results
+    return load_detection_results(), "file", db_error
+
+@st.cache_resource(ttl=300)
+def get_results_by_time():
+    """
+    Sort the results by timestamp once and return them with int64 timestamp and
+    has-timestamp arrays, and whether any result carries geolocation data.
+    """
+    data, _, _ = get_results()
+    sorted_results = sorted(data, key=lambda r: r.get('timestamp', 0))
+    timestamps = np.fromiter((r.get('timestamp', 0) for r in sorted_results), dtype=np.int64, count=len(sorted_results))
+    has_timestamp = np.fromiter(('timestamp' in r for r in sorted_results), dtype=bool, count=len(sorted_results))
+    has_geo = any('latitude' in r.get('metadata', {}) and 'longitude' in r.get('metadata', {}) for r in sorted_results)
+    return sorted_results, timestamps, has_timestamp, has_geo
+
+# Report where the results came from outside the cached functions
+_, results_source, results_db_error = get_results()
+if results_db_error:
+    st.sidebar.warning(f"Database error: {results_db_error}")
+if results_source == "database":
+    st.sidebar.success("Using database map data")
+else:
     st.sidebar.info("Using file-based map data")
-    return load_detection_results()
 
-results = get_results()
+results, result_timestamps, result_has_timestamp, has_geo_data = get_results_by_time()
 
 if not results:
     st.info("No detection data available. Please process some images first.")
@@ -72,9 +94,6 @@ if not results:
     
     st.stop()
 
-# Check if any results have geolocation data
-has_geo_data = any('metadata' in r and 'latitude' in r.get('metadata', {}) and 'longitude' in r.get('metadata', {}) for r in results)
-
 if not has_geo_data:
     st.warning("No geotagged images found in your data. For demonstration purposes, we'll show a simulated map.")
     st.markdown("""
@@ -113,35 +132,79 @@ if not has_geo_data:
             center_lon = st.number_input("Longitude", value=default_lon, format="%.4f")
     
     # Generate simulated geolocation data
-    for r in results:
-        # Add random offset (up to 0.05 degrees ~ 5km)
-        lat_offset = (random.random() - 0.5) * 0.05
-        lon_offset = (random.random() - 0.5) * 0.05
-        
-        # Store in metadata
-        if 'metadata' not in r:
-            r['metadata'] = {}
-        
-        r['metadata']['latitude'] = center_lat + lat_offset
-        r['metadata']['longitude'] = center_lon + lon_offset
+    # Random offsets (up to 0.05 degrees ~ 5km) for every result in one call,
+    # seeded so the simulated map and its cached figure stay stable across reruns
+    rng = np.random.default_rng(0)
+    offsets = (rng.random((len(results), 2), dtype=np.float32) - 0.5) * 0.05
+    # Wrap each result in a new dict so the shared cached results stay untouched
+    results = [
+        {
+            **r,
+            'metadata': {
+                **r.get('metadata', {}),
+                'latitude': center_lat + float(lat_offset),
+                'longitude': center_lon + float(lon_offset)
+            }
+        }
+        for r, (lat_offset, lon_offset) in zip(results, offsets)
+    ]
     
     st.info("Simulated geolocation data has been generated for demonstration.")
 
-# Create the map
-st.subheader("Pothole Detection Map")
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def get_db_clusters():
+    """Get hotspot clusters pre-aggregated by the database, if one is available."""
+    if not DATABASE_AVAILABLE:
+        return []
+    try:
+        return get_map_clusters(resolution=1)
+    except Exception:
+        return []
 
-# Create the map visualization
-pothole_map = create_pothole_map(results)
-st.plotly_chart(pothole_map, use_container_width=True)
+@st.cache_data(show_spinner=False)
+def get_hotspot_clusters(latitude, longitude, detections):
+    """Group the geotagged points into hotspots, reused while the inputs are unchanged."""
+    # Group nearby locations into hotspots (DBSCAN when available, grid otherwise)
+    labels = label_hotspots(latitude, longitude)
+    
+    # Group by cluster
+    return pd.DataFrame({
+        'latitude': latitude,
+        'longitude': longitude,
+        'detections': detections
+    }).groupby(labels).agg({
+        'detections': 'sum',
+        'latitude': 'mean',
+        'longitude': 'mean'
+    }).reset_index(drop=True)
+
+@st.cache_data(show_spinner=False)
+def compute_hotspots(latitude, longitude, detections):
+    """Rank the hotspot centroids and format the top 10 for display."""
+    # Sort by number of detections and keep only top 10
+    top = np.argsort(-detections, kind='stable')[:10]
+    return pd.DataFrame({
+        'Rank': np.arange(1, len(top) + 1),
+        'Latitude': np.round(latitude[top], 4),
+        'Longitude': np.round(longitude[top], 4),
+        'Potholes Detected': detections[top]
+    })
+
+@st.cache_data(show_spinner=False)
+def build_map(points):
+    """Build the pothole map figure, reused while the plotted points are unchanged."""
+    return create_map_from_points(points)
 
 # Map filters
 st.sidebar.header("Map Filters")
 
 # Date range filter
-all_timestamps = [r.get('timestamp', 0) for r in results if 'timestamp' in r]
-if all_timestamps:
-    min_date = datetime.fromtimestamp(min(all_timestamps))
-    max_date = datetime.fromtimestamp(max(all_timestamps))
+filtered_results = None
+# Timestamps are sorted, so the bounds are the first and last stamped entries
+all_timestamps = result_timestamps[result_has_timestamp]
+if all_timestamps.size:
+    min_date = datetime.fromtimestamp(int(all_timestamps[0]))
+    max_date = datetime.fromtimestamp(int(all_timestamps[-1]))
     
     # Round dates to days
     min_date = min_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -158,45 +221,74 @@ if all_timestamps:
         start_date = datetime.combine(date_range[0], datetime.min.time())
         end_date = datetime.combine(date_range[1], datetime.max.time())
         
-        # Filter results by date
-        filtered_results = [
-            r for r in results 
-            if start_date <= datetime.fromtimestamp(r.get('timestamp', 0)) <= end_date
-        ]
+        # Filter results by date with a binary search over the sorted timestamps
+        lo = np.searchsorted(result_timestamps, int(start_date.timestamp()), side='left')
+        hi = np.searchsorted(result_timestamps, int(end_date.timestamp()), side='right')
+        filtered_results = results[lo:hi]
         
         if filtered_results:
             st.sidebar.info(f"Showing {len(filtered_results)} of {len(results)} images")
-            
-            # Update the map
-            filtered_map = create_pothole_map(filtered_results)
-            st.plotly_chart(filtered_map, use_container_width=True)
+
+# The map and the insights below describe the same results, the filtered ones when the date range narrows them
+is_filtered = bool(filtered_results) and len(filtered_results) < len(results)
+map_results = filtered_results if is_filtered else results
+
+# Group the plotted results into hotspots, shared by the map and the insights below
+clusters = None
+db_clusters = []
+if results_source == "database" and has_geo_data and not is_filtered:
+    # The map shows the real database coordinates, so the database can group them
+    db_clusters = get_db_clusters()
+if db_clusters:
+    # Already grouped by the database, no per-result pass needed
+    clusters = pd.DataFrame(db_clusters).rename(columns={'detection_count': 'detections'})
+    total_locations = int(clusters['image_count'].sum())
+else:
+    # Extract coordinates and counts straight into contiguous float32/int32 columns
+    latitudes = np.full(len(map_results), np.nan, dtype=np.float32)
+    longitudes = np.full(len(map_results), np.nan, dtype=np.float32)
+    detection_counts = np.zeros(len(map_results), dtype=np.int32)
+    for i, r in enumerate(map_results):
+        metadata = r.get('metadata', {})
+        if 'latitude' in metadata and 'longitude' in metadata:
+            latitudes[i] = metadata['latitude']
+            longitudes[i] = metadata['longitude']
+        # Database rows carry a count instead of the detection list
+        detection_counts[i] = r['detection_count'] if 'detection_count' in r else len(r.get('detections', ()))
+    
+    has_location = ~np.isnan(latitudes) & (detection_counts > 0)
+    
+    if has_location.any():
+        total_locations = int(has_location.sum())
+        clusters = get_hotspot_clusters(
+            latitudes[has_location],
+            longitudes[has_location],
+            detection_counts[has_location]
+        )
+
+# Create the map
+st.subheader("Pothole Detection Map")
+
+# Draw a single chart for either the filtered or the full data
+if len(map_results) > MAP_CLUSTER_THRESHOLD and clusters is not None and not clusters.empty:
+    # Plot the hotspots instead of every result for large data sets
+    map_points = tuple(zip(
+        clusters['latitude'].tolist(),
+        clusters['longitude'].tolist(),
+        clusters['detections'].tolist(),
+        ["Hotspot"] * len(clusters)
+    ))
+else:
+    map_points = get_map_points(map_results)
+pothole_map = build_map(map_points)
+st.plotly_chart(pothole_map, use_container_width=True)
 
 # Show statistics about the geographical distribution
 st.subheader("Geographical Insights")
 
-# Extract coordinates and counts
-geo_data = []
-for r in results:
-    metadata = r.get('metadata', {})
-    if 'latitude' in metadata and 'longitude' in metadata:
-        lat = metadata['latitude']
-        lon = metadata['longitude']
-        count = len(r.get('detections', []))
-        
-        if count > 0:
-            geo_data.append({
-                'latitude': lat,
-                'longitude': lon,
-                'detections': count
-            })
-
-if geo_data:
-    # Create dataframe
-    geo_df = pd.DataFrame(geo_data)
-    
+if clusters is not None and not clusters.empty:
     # Calculate statistics
-    total_locations = len(geo_df)
-    total_potholes = geo_df['detections'].sum()
+    total_potholes = clusters['detections'].sum()
     avg_per_location = total_potholes / total_locations if total_locations > 0 else 0
     
     # Display metrics
@@ -208,46 +300,22 @@ if geo_data:
     with col3:
         st.metric("Avg. Potholes per Location", f"{avg_per_location:.2f}")
     
-    # Group by location and count potholes
-    # For demonstration, we'll create artificial clusters
-    # In a real app, you would use a clustering algorithm like DBSCAN
-    
-    # Create artificial clusters based on latitude/longitude grid
-    geo_df['lat_cluster'] = (geo_df['latitude'] * 10).astype(int) / 10
-    geo_df['lon_cluster'] = (geo_df['longitude'] * 10).astype(int) / 10
-    
-    # Group by cluster
-    clusters = geo_df.groupby(['lat_cluster', 'lon_cluster']).agg({
-        'detections': 'sum',
-        'latitude': 'mean',
-        'longitude': 'mean'
-    }).reset_index()
-    
     # Display hotspots table
     st.subheader("Pothole Hotspots")
     
-    # Sort by number of detections
-    clusters = clusters.sort_values('detections', ascending=False)
-    
-    # Add rank column
-    clusters['rank'] = range(1, len(clusters) + 1)
-    
-    # Keep only top 10
-    top_clusters = clusters.head(10)
-    
-    # Format table for display
-    display_df = pd.DataFrame({
-        'Rank': top_clusters['rank'],
-        'Latitude': top_clusters['latitude'].round(4),
-        'Longitude': top_clusters['longitude'].round(4),
-        'Potholes Detected': top_clusters['detections']
-    })
+    display_df = compute_hotspots(
+        clusters['latitude'].to_numpy(),
+        clusters['longitude'].to_numpy(),
+        clusters['detections'].to_numpy()
+    )
     
-    st.table(display_df)
+    st.dataframe(display_df, hide_index=True, use_container_width=True)
 else:
     st.info("Not enough data to show geographical insights.")
 
 # Add a refresh button
 if st.sidebar.button("Refresh Map"):
+    get_results.clear()
+    get_results_by_time.clear()
     st.cache_data.clear()
     st.rerun()
@@ -5,23 +5,34 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import pydeck as pdk
+from datetime import datetime, date, timedelta
 import json
 import random
 import base64
 import time
 from pathlib import Path
+import hashlib
+import math
 import uuid
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.data_processing import load_detection_results, DATABASE_AVAILABLE
+from utils.data_processing import load_detection_results, grid_cell_keys, count_completion_buckets, DATABASE_AVAILABLE
 from utils.tutorial import get_tutorial_manager
 from utils.twilio_integration import send_alert, check_twilio_credentials
 
 # Try to import database functions if available
 if DATABASE_AVAILABLE:
     from utils.database import get_map_data, get_all_detections, get_detection_statistics
+    from utils.database import get_repair_requests, get_repair_requests_version, save_repair_requests
+
+# Use orjson for the saved requests when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 st.set_page_config(
     page_title="Road Repair Requests - Pothole Detection System",
@@ -39,10 +50,8 @@ if tutorial_manager.is_active():
 st.title("🛠️ Road Repair Requests")
 st.markdown("Submit and track repair requests for detected potholes with one click")
 
-# Function to load mascot animation
-def load_mascot_animation():
-    # Create simple CSS animation for the mascot
-    return """
+# Simple CSS animation for the mascot, status badges and request cards
+_MASCOT_CSS = """
     <style>
     @keyframes bounce {
         0%, 20%, 50%, 80%, 100% {transform: translateY(0);}
@@ -173,23 +182,222 @@ def load_mascot_animation():
     </style>
     """
 
+# Emit the styles once per run, shared by every mascot and card below
+st.markdown(_MASCOT_CSS, unsafe_allow_html=True)
+
 # Create session state for repair requests if it doesn't exist
 if 'repair_requests' not in st.session_state:
     st.session_state.repair_requests = []
 
-# Load saved repair requests if available
+# Used when no database is available, and migrated into the database once when one is
 repair_requests_file = "data/repair_requests.json"
-if os.path.exists(repair_requests_file):
+# Columnar snapshot of the requests, read straight into DataFrames for tracking and analytics
+repair_requests_frame_file = "data/repair_requests.parquet"
+
+# Number of repair request cards shown per page in the tracking tab
+REQUESTS_PAGE_SIZE = 20
+
+# Above this many pothole locations the map shows aggregated grid cells
+MAP_AGGREGATE_THRESHOLD = 500
+
+# Above this many repair requests the analytics map shows a binned density instead of every request
+ANALYTICS_DENSITY_THRESHOLD = 5000
+
+# Fixed vocabularies of the repair request fields, used as categorical dtypes in the analytics
+REQUEST_STATUSES = ["New", "Processing", "Scheduled", "Completed", "Rejected"]
+REQUEST_PRIORITIES = ["High", "Medium", "Low"]
+REPAIR_TYPES = ["Patching", "Full Resurfacing", "Crack Sealing", "Pothole Filling"]
+
+def read_repair_requests_file():
+    """Parse the repair requests saved in the JSON file."""
+    data = Path(repair_requests_file).read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def stored_repair_requests_version():
+    """Cheap fingerprint of the stored repair requests, None when nothing is stored."""
+    if DATABASE_AVAILABLE:
+        version = get_repair_requests_version()
+        return version if version and version[0] else None
+    if os.path.exists(repair_requests_file):
+        return os.path.getmtime(repair_requests_file)
+    return None
+
+@st.cache_data(show_spinner=False)
+def load_repair_requests(version):
+    """
+    Load the stored repair requests once per stored version.
+    
+    Each call returns a fresh copy, since sessions edit their requests (and
+    their update history) in place before saving them.
+    """
+    if DATABASE_AVAILABLE:
+        return get_repair_requests()
+    return read_repair_requests_file()
+
+def index_repair_requests():
+    """Rebuild the pothole ID and request ID lookups, keeping the first request for each ID."""
+    requests = st.session_state.repair_requests
+    st.session_state.requests_by_pothole_id = {req.get('pothole_id'): req for req in reversed(requests)}
+    st.session_state.requests_by_request_id = {req.get('request_id'): req for req in reversed(requests)}
+
+def mark_repair_requests_changed(request_id):
+    """Mark a repair request as changed; changes are written once by flush_repair_requests()."""
+    st.session_state.setdefault('repair_requests_dirty', set()).add(request_id)
+    
+    # Count edits under a token unique to this session, so cached results built from
+    # the edited requests are never shared with sessions holding different ones
+    edits = st.session_state.get('repair_requests_edits')
+    st.session_state.repair_requests_edits = (edits[0], edits[1] + 1) if edits else (uuid.uuid4().hex, 1)
+    index_repair_requests()
+
+def flush_repair_requests():
+    """Write the changed repair requests, as single rows in the database or by rewriting the JSON file."""
+    changed = st.session_state.pop('repair_requests_dirty', None)
+    if not changed:
+        return
+    
+    if DATABASE_AVAILABLE:
+        requests_by_request_id = st.session_state.requests_by_request_id
+        if not save_repair_requests([requests_by_request_id[rid] for rid in changed if rid in requests_by_request_id]):
+            st.error("Error saving repair requests to the database")
+        st.session_state.repair_requests_version = stored_repair_requests_version()
+        return
+    
+    os.makedirs(os.path.dirname(repair_requests_file), exist_ok=True)
+    if ORJSON_AVAILABLE:
+        Path(repair_requests_file).write_bytes(orjson.dumps(st.session_state.repair_requests))
+    else:
+        with open(repair_requests_file, 'w') as f:
+            json.dump(st.session_state.repair_requests, f)
+    st.session_state.repair_requests_version = os.path.getmtime(repair_requests_file)
+    
+    # Refresh the Parquet snapshot; the JSON file stays the source of truth
+    try:
+        requests_frame(st.session_state.repair_requests).to_parquet(
+            repair_requests_frame_file, engine='pyarrow', compression='zstd', index=False
+        )
+    except Exception as e:
+        print(f"Error writing repair requests snapshot: {e}")
+
+def requests_frame(requests):
+    """Build the flat DataFrame of repair requests, leaving out the nested update history."""
+    return pd.DataFrame(requests).drop(columns=['update_history'], errors='ignore')
+
+@st.cache_data(show_spinner=False)
+def load_requests_frame(_requests, version):
+    """Load the repair requests as a DataFrame, from the Parquet snapshot when it is current."""
+    # The snapshot only follows the JSON file, it is not kept in step with the database
+    # or with edits this session has not loaded back from the store
+    edits = version[-1]
+    if not DATABASE_AVAILABLE and edits is None and os.path.exists(repair_requests_frame_file) and os.path.exists(repair_requests_file) and \
+       os.path.getmtime(repair_requests_frame_file) >= os.path.getmtime(repair_requests_file):
+        try:
+            return pd.read_parquet(repair_requests_frame_file, engine='pyarrow')
+        except Exception:
+            pass
+    return requests_frame(_requests)
+
+def requests_version():
+    """
+    Key that changes whenever the session's repair requests change.
+    
+    Sessions holding the requests exactly as loaded share a key, and with it the
+    cached frames and counts; once a session edits its requests the key is its own.
+    """
+    return (
+        st.session_state.get('repair_requests_version'),
+        len(st.session_state.repair_requests),
+        st.session_state.get('repair_requests_edits')
+    )
+
+def apply_status_update(req, current_status, new_status, update_notes, scheduled_date=None, schedule_notes=None):
+    """
+    Apply a status change to a repair request in place.
+    
+    Args:
+        req: repair request dictionary to update
+        current_status: status the request had when the form was shown
+        new_status: status selected in the form
+        update_notes: notes to add to the update history, if any
+        scheduled_date: date picked for a newly scheduled repair, if any
+        schedule_notes: notes about the schedule, if any
+    """
+    # One timestamp for every field set by this update
+    now = datetime.now()
+    now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+    today_str = now.strftime('%Y-%m-%d')
+    
+    req['status'] = new_status
+    req['last_updated'] = now_str
+    
+    # Add update notes
+    if update_notes:
+        if 'update_history' not in req:
+            req['update_history'] = []
+        req['update_history'].append({
+            'date': now_str,
+            'from_status': current_status,
+            'to_status': new_status,
+            'notes': update_notes
+        })
+    
+    # Add scheduled date if applicable
+    if new_status == 'Scheduled' and scheduled_date is not None and (current_status != 'Scheduled' or not req.get('scheduled_date')):
+        req['scheduled_date'] = scheduled_date.strftime('%Y-%m-%d')
+        if schedule_notes:
+            req['schedule_notes'] = schedule_notes
+    
+    # Update expected completion date based on status
+    if new_status == 'Processing':
+        req['expected_completion'] = (now + timedelta(days=5 if req.get('priority') == 'High' else 10 if req.get('priority') == 'Medium' else 20)).strftime('%Y-%m-%d')
+    elif new_status == 'Scheduled':
+        # Use the picked date directly, only parsing the stored one when nothing new was picked
+        if scheduled_date is None:
+            scheduled_date = date.fromisoformat(req.get('scheduled_date', today_str))
+        req['expected_completion'] = (scheduled_date + timedelta(days=1)).strftime('%Y-%m-%d')
+    elif new_status == 'Completed':
+        req['completion_date'] = today_str
+
+# Write out changes from the previous run before checking the store, e.g. when a save ended in st.rerun()
+flush_repair_requests()
+
+repair_requests_version = stored_repair_requests_version()
+
+# Move requests saved before the database was available into it, once, while its table is still empty
+if DATABASE_AVAILABLE and repair_requests_version is None and os.path.exists(repair_requests_file):
     try:
-        with open(repair_requests_file, 'r') as f:
-            st.session_state.repair_requests = json.load(f)
+        first_by_request_id = {}
+        for req in read_repair_requests_file():
+            first_by_request_id.setdefault(req.get('request_id'), req)
+        first_by_request_id.pop(None, None)
+        if save_repair_requests(list(first_by_request_id.values())):
+            repair_requests_version = stored_repair_requests_version()
+    except Exception as e:
+        st.error(f"Error migrating repair requests to the database: {e}")
+
+# Load saved repair requests if available, only when the store changed since this session last saw it
+if repair_requests_version is not None and st.session_state.get('repair_requests_version') != repair_requests_version:
+    try:
+        st.session_state.repair_requests = load_repair_requests(repair_requests_version)
+        st.session_state.repair_requests_version = repair_requests_version
+        st.session_state.repair_requests_edits = None
+        index_repair_requests()
     except Exception as e:
         st.error(f"Error loading repair requests: {e}")
 
-# Create tabs for different sections
-tab1, tab2, tab3 = st.tabs(["Create Request", "Track Requests", "Analytics"])
+if 'requests_by_request_id' not in st.session_state:
+    index_repair_requests()
+
+# Create tabs for different sections, only rendering the selected one on each rerun
+active_tab = st.radio(
+    "Section",
+    ["Create Request", "Track Requests", "Analytics"],
+    horizontal=True,
+    label_visibility="collapsed",
+    key="repair_active_tab"
+)
 
-with tab1:
+if active_tab == "Create Request":
     st.subheader("Submit Repair Request")
     
     # Explanation of the one-click repair system
@@ -198,106 +406,151 @@ with tab1:
     Simply select a pothole location and submit a repair request with one click.
     """)
     
+    def pothole_id(image_path, timestamp):
+        """Stable 8-character pothole ID derived from the image path and detection time."""
+        return hashlib.blake2b(f"{image_path}|{timestamp}".encode(), digest_size=4).hexdigest()
+    
+    def mean_confidence(detections):
+        """Average detection confidence, computed with NumPy."""
+        confidences = np.fromiter((d.get('confidence', 0.0) for d in detections), dtype=np.float64, count=len(detections))
+        return float(confidences.mean()) if confidences.size else 0.0
+    
     # Get critical areas data
     @st.cache_data(ttl=300)  # Cache for 5 minutes
     def get_pothole_locations():
+        """Load the pothole locations as a DataFrame with a prebuilt selector label column."""
+        locations = []
+        # Default timestamp for locations without one, computed once rather than per row
+        now_ts = datetime.now().timestamp()
+        
         if DATABASE_AVAILABLE:
             try:
                 # Try to get data from database
-                geo_data = get_map_data()
-                if geo_data:
-                    return geo_data
+                for row in get_map_data():
+                    count = row.get('detection_count', 0)
+                    locations.append({
+                        'id': str(row.get('image_id')),
+                        'image': row.get('image_path', 'unknown'),
+                        'latitude': row.get('latitude'),
+                        'longitude': row.get('longitude'),
+                        'count': count,
+                        'severity': min(10, count * 2),  # Scale from 1-10
+                        'timestamp': row.get('timestamp', now_ts),
+                        'confidence': 0.0
+                    })
             except Exception:
-                pass
-        
-        # Fallback to file-based results
-        results = load_detection_results()
+                locations = []
         
-        # Extract locations
-        locations = []
-        
-        for result in results:
-            detections = result.get('detections', [])
-            if detections:
-                metadata = result.get('metadata', {})
+        if locations:
+            df = pd.DataFrame(locations)
+        else:
+            # Fallback to file-based results
+            results = [result for result in load_detection_results() if result.get('detections')]
+            n = len(results)
+            
+            if n:
+                # Missing coordinates become NaN and are filled in one vectorized pass
+                latitudes = np.array([result.get('metadata', {}).get('latitude') for result in results], dtype=float)
+                longitudes = np.array([result.get('metadata', {}).get('longitude') for result in results], dtype=float)
+                counts = np.fromiter((len(result['detections']) for result in results), dtype=np.int64, count=n)
                 
                 # Generate random coordinates if none exist (for demonstration)
-                if 'latitude' not in metadata or 'longitude' not in metadata:
-                    metadata['latitude'] = random.uniform(40.7, 40.8)  # NYC area
-                    metadata['longitude'] = random.uniform(-74.0, -73.9)
+                missing = np.isnan(latitudes) | np.isnan(longitudes)
+                latitudes = np.where(missing, np.random.uniform(40.7, 40.8, n), latitudes)  # NYC area
+                longitudes = np.where(missing, np.random.uniform(-74.0, -73.9, n), longitudes)
                 
-                locations.append({
-                    'id': str(uuid.uuid4())[:8],
-                    'image': result.get('image_path', 'unknown'),
-                    'latitude': metadata.get('latitude'),
-                    'longitude': metadata.get('longitude'),
-                    'count': len(detections),
-                    'severity': min(10, len(detections) * 2),  # Scale from 1-10
-                    'timestamp': result.get('timestamp', datetime.now().timestamp()),
-                    'confidence': sum(d.get('confidence', 0) for d in detections) / len(detections) if detections else 0
+                df = pd.DataFrame({
+                    'id': [pothole_id(result.get('image_path', 'unknown'), result.get('timestamp')) for result in results],
+                    'image': [result.get('image_path', 'unknown') for result in results],
+                    'latitude': latitudes,
+                    'longitude': longitudes,
+                    'count': counts,
+                    'severity': np.minimum(10, counts * 2),  # Scale from 1-10
+                    'timestamp': [result.get('timestamp', now_ts) for result in results],
+                    'confidence': [mean_confidence(result['detections']) for result in results]
                 })
-        
-        # If no real data, create some demo data
-        if not locations:
-            # Create 10 random locations
-            for i in range(10):
-                locations.append({
-                    'id': f"DEMO{i+1:03d}",
-                    'image': f"demo_image_{i+1}.jpg",
-                    'latitude': 40.7 + random.uniform(-0.1, 0.1),
-                    'longitude': -74.0 + random.uniform(-0.1, 0.1),
-                    'count': random.randint(1, 5),
-                    'severity': random.randint(3, 10),
-                    'timestamp': (datetime.now() - timedelta(days=random.randint(0, 30))).timestamp(),
-                    'confidence': random.uniform(0.5, 0.95)
+            else:
+                # If no real data, create 10 random demo locations in one batch
+                n = 10
+                df = pd.DataFrame({
+                    'id': [f"DEMO{i:03d}" for i in range(1, n + 1)],
+                    'image': [f"demo_image_{i}.jpg" for i in range(1, n + 1)],
+                    'latitude': 40.7 + np.random.uniform(-0.1, 0.1, n),
+                    'longitude': -74.0 + np.random.uniform(-0.1, 0.1, n),
+                    'count': np.random.randint(1, 6, n),
+                    'severity': np.random.randint(3, 11, n),
+                    'timestamp': now_ts - np.random.randint(0, 31, n) * 86400.0,
+                    'confidence': np.random.uniform(0.5, 0.95, n)
                 })
         
-        return locations
+        # Add a column for the location selector labels
+        df['label'] = (
+            "ID: " + df['id'].astype(str)
+            + " - Severity: " + df['severity'].map('{:.1f}'.format)
+            + "/10 - Location: (" + df['latitude'].map('{:.4f}'.format)
+            + ", " + df['longitude'].map('{:.4f}'.format) + ")"
+        )
+        
+        return df
     
     pothole_locations = get_pothole_locations()
     
-    if not pothole_locations:
+    if pothole_locations.empty:
         st.info("No pothole locations found. Process some images or check the database connection.")
         st.stop()
     
     # Display map of pothole locations
     st.subheader("Pothole Locations Map")
     
-    # Convert to DataFrame for plotting
-    df = pd.DataFrame(pothole_locations)
-    
-    # Add a column for hover text
-    df['hover_text'] = df.apply(lambda row: f"ID: {row['id']}<br>Severity: {row['severity']:.1f}/10<br>Potholes: {row['count']}", axis=1)
-    
-    # Create map
-    fig = px.scatter_mapbox(
-        df,
-        lat="latitude",
-        lon="longitude",
-        size="count",
-        color="severity",
-        color_continuous_scale=px.colors.sequential.Reds,
-        size_max=15,
-        zoom=10,
-        hover_name="id",
-        hover_data={
-            "hover_text": True,
-            "count": False,
-            "severity": False,
-            "latitude": False,
-            "longitude": False,
-            "id": False
-        },
-        title="Pothole Locations"
-    )
+    def aggregate_pothole_locations(df, resolution=0.01):
+        """Pre-aggregate locations into grid cells (~1 km at the default resolution) for large maps."""
+        cells = df.groupby(grid_cell_keys(df['latitude'].to_numpy(), df['longitude'].to_numpy(), resolution)).agg(
+            latitude=('latitude', 'mean'),
+            longitude=('longitude', 'mean'),
+            count=('count', 'sum'),
+            severity=('severity', 'max'),
+            locations=('id', 'size')
+        ).reset_index(drop=True)
+        return cells
     
-    fig.update_layout(
-        mapbox_style="open-street-map",
-        margin={"r": 0, "t": 0, "l": 0, "b": 0},
-        height=500
-    )
+    @st.cache_resource(show_spinner=False, max_entries=8)
+    def build_pothole_map(df):
+        """Build the pothole locations map, reused while the locations are unchanged."""
+        # Ship grid cells instead of every location once there are too many to draw individually
+        # The tooltip reads the layer's columns directly, so no hover text is built in Python
+        if len(df) > MAP_AGGREGATE_THRESHOLD:
+            df = aggregate_pothole_locations(df)
+            tooltip_html = "{locations} locations<br>Max severity: {severity}/10<br>Potholes: {count}"
+        else:
+            df = df[['id', 'latitude', 'longitude', 'count', 'severity']]
+            tooltip_html = "ID: {id}<br>Severity: {severity}/10<br>Potholes: {count}"
+        
+        # One WebGL scatter layer, sized by pothole count and shaded red by severity
+        layer = pdk.Layer(
+            "ScatterplotLayer",
+            df,
+            get_position=['longitude', 'latitude'],
+            get_radius='count * 20',
+            radius_min_pixels=4,
+            radius_max_pixels=15,
+            get_fill_color='[255, 255 - severity * 25, 0, 160]',
+            pickable=True
+        )
+        
+        return pdk.Deck(
+            layers=[layer],
+            initial_view_state=pdk.ViewState(
+                latitude=float(df['latitude'].mean()),
+                longitude=float(df['longitude'].mean()),
+                zoom=10
+            ),
+            map_provider="carto",
+            map_style="light",
+            tooltip={"html": tooltip_html}
+        )
     
-    st.plotly_chart(fig, use_container_width=True)
+    deck = build_pothole_map(pothole_locations)
+    st.pydeck_chart(deck, use_container_width=True, height=500)
     
     # Form for selecting a pothole location and submitting a repair request
     st.subheader("Submit a Repair Request")
@@ -306,12 +559,14 @@ with tab1:
     
     with col1:
         # Select pothole location
-        location_options = [f"ID: {loc['id']} - Severity: {loc['severity']:.1f}/10 - Location: ({loc['latitude']:.4f}, {loc['longitude']:.4f})" for loc in pothole_locations]
-        selected_location = st.selectbox("Select Pothole Location", options=location_options)
-        
-        # Get the selected location index
-        location_idx = location_options.index(selected_location)
-        selected_pothole = pothole_locations[location_idx]
+        # Options are row positions so the selection maps straight back to its row
+        location_labels = pothole_locations['label']
+        location_idx = st.selectbox(
+            "Select Pothole Location",
+            options=range(len(location_labels)),
+            format_func=location_labels.iat.__getitem__
+        )
+        selected_pothole = pothole_locations.iloc[[location_idx]].to_dict('records')[0]
         
         # Display selected pothole details
         st.markdown(f"""
@@ -328,14 +583,12 @@ with tab1:
         priority_options = ["High", "Medium", "Low"]
         priority = st.selectbox("Priority", options=priority_options, index=0 if selected_pothole['severity'] >= 7 else 1 if selected_pothole['severity'] >= 4 else 2)
         
-        repair_types = ["Patching", "Full Resurfacing", "Crack Sealing", "Pothole Filling"]
-        repair_type = st.selectbox("Repair Type", options=repair_types, index=0 if selected_pothole['severity'] >= 7 else 3)
+        repair_type = st.selectbox("Repair Type", options=REPAIR_TYPES, index=0 if selected_pothole['severity'] >= 7 else 3)
         
         additional_notes = st.text_area("Additional Notes", placeholder="Enter any additional information about this repair request...")
     
     # Check if this pothole location already has a repair request
-    existing_request = next((req for req in st.session_state.repair_requests 
-                           if req.get('pothole_id') == selected_pothole['id']), None)
+    existing_request = st.session_state.requests_by_pothole_id.get(selected_pothole['id'])
     
     if existing_request:
         st.warning(f"This pothole location already has a repair request (ID: {existing_request['request_id']}) with status: {existing_request['status']}")
@@ -350,14 +603,12 @@ with tab1:
                 'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             })
             
-            # Save to file
-            with open(repair_requests_file, 'w') as f:
-                json.dump(st.session_state.repair_requests, f)
+            # Queue the save
+            mark_repair_requests_changed(existing_request['request_id'])
             
             st.success("Repair request updated successfully!")
             
             # Show the mascot
-            st.markdown(load_mascot_animation(), unsafe_allow_html=True)
             st.markdown(f"""
             <div class="mascot-container">
                 <div class="mascot-speech">Request updated! I'll make sure this pothole gets fixed ASAP!</div>
@@ -366,10 +617,11 @@ with tab1:
             """, unsafe_allow_html=True)
     else:
         # One-Click Repair Request button
-        st.markdown(load_mascot_animation(), unsafe_allow_html=True)
         if st.button("🛠️ Submit Repair Request", type="primary"):
-            # Create a new repair request
-            request_id = f"REQ-{datetime.now().strftime('%Y%m%d')}-{random.randint(1000, 9999)}"
+            # Create a new repair request, stamping every field with the same time
+            now = datetime.now()
+            now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+            request_id = f"REQ-{now.strftime('%Y%m%d')}-{random.randint(1000, 9999)}"
             
             new_request = {
                 'request_id': request_id,
@@ -382,18 +634,16 @@ with tab1:
                 'repair_type': repair_type,
                 'notes': additional_notes,
                 'status': 'New',
-                'submission_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'expected_completion': (datetime.now() + timedelta(days=7 if priority == "High" else 14 if priority == "Medium" else 30)).strftime('%Y-%m-%d')
+                'submission_date': now_str,
+                'last_updated': now_str,
+                'expected_completion': (now + timedelta(days=7 if priority == "High" else 14 if priority == "Medium" else 30)).strftime('%Y-%m-%d')
             }
             
             # Add to session state
             st.session_state.repair_requests.append(new_request)
             
-            # Save to file
-            os.makedirs(os.path.dirname(repair_requests_file), exist_ok=True)
-            with open(repair_requests_file, 'w') as f:
-                json.dump(st.session_state.repair_requests, f)
+            # Queue the save
+            mark_repair_requests_changed(new_request['request_id'])
             
             # Show success message
             st.markdown(f"""
@@ -429,7 +679,7 @@ with tab1:
                 else:
                     st.info(f"SIMULATED SMS to {first_number}: {alert_msg}")
 
-with tab2:
+if active_tab == "Track Requests":
     st.subheader("Track Repair Requests")
     
     # Filter options
@@ -456,35 +706,55 @@ with tab2:
             index=0
         )
     
+    def render_request_card(request):
+        """Format one repair request as a card's HTML."""
+        return f"""<div class="repair-card">
+<h3>Request ID: {request.get('request_id', 'Unknown')}</h3>
+<span class="status-badge status-{request.get('status', 'New').lower()}">{request.get('status', 'New')}</span>
+<p><strong>Pothole ID:</strong> {request.get('pothole_id', 'Unknown')}</p>
+<p><strong>Location:</strong> ({request.get('latitude', 0):.4f}, {request.get('longitude', 0):.4f})</p>
+<p><strong>Priority:</strong> {request.get('priority', 'Unknown')}</p>
+<p><strong>Repair Type:</strong> {request.get('repair_type', 'Unknown')}</p>
+<p><strong>Submitted:</strong> {request.get('submission_date', 'Unknown')}</p>
+<p><strong>Expected Completion:</strong> {request.get('expected_completion', 'Unknown')}</p>
+</div>"""
+    
     # Function to sort and filter requests
-    def sort_and_filter_requests(requests, status_filter, priority_filter, sort_by):
-        # Make a copy to avoid modifying the original
-        filtered_requests = requests.copy()
+    @st.cache_data(show_spinner=False)
+    def get_request_order(_requests, version, status_filter, priority_filter, sort_by):
+        """Return the positions of the matching requests in display order, reused until the requests change."""
+        df = load_requests_frame(_requests, version).reindex(columns=['status', 'priority', 'submission_date'])
+        mask = np.ones(len(df), dtype=bool)
         
         # Apply status filter
         if "All" not in status_filter:
-            filtered_requests = [req for req in filtered_requests if req.get('status') in status_filter]
+            mask &= df['status'].isin(status_filter).to_numpy()
         
         # Apply priority filter
         if "All" not in priority_filter:
-            filtered_requests = [req for req in filtered_requests if req.get('priority') in priority_filter]
+            mask &= df['priority'].isin(priority_filter).to_numpy()
+        
+        df = df[mask]
         
-        # Apply sorting
+        # Apply sorting, using ordered categorical codes so unknown values (-1) sort lowest
         if sort_by == "Submission Date (Newest)":
-            filtered_requests.sort(key=lambda x: x.get('submission_date', ''), reverse=True)
+            df = df.sort_values('submission_date', ascending=False, kind='stable', na_position='last')
         elif sort_by == "Submission Date (Oldest)":
-            filtered_requests.sort(key=lambda x: x.get('submission_date', ''))
-        elif sort_by == "Priority (Highest)":
-            priority_map = {"High": 3, "Medium": 2, "Low": 1}
-            filtered_requests.sort(key=lambda x: priority_map.get(x.get('priority'), 0), reverse=True)
-        elif sort_by == "Priority (Lowest)":
-            priority_map = {"High": 3, "Medium": 2, "Low": 1}
-            filtered_requests.sort(key=lambda x: priority_map.get(x.get('priority'), 0))
+            df = df.sort_values('submission_date', kind='stable', na_position='first')
+        elif sort_by in ("Priority (Highest)", "Priority (Lowest)"):
+            priority_codes = pd.Categorical(df['priority'], categories=["Low", "Medium", "High"], ordered=True).codes
+            if sort_by == "Priority (Highest)":
+                priority_codes = -priority_codes
+            df = df.iloc[np.argsort(priority_codes, kind='stable')]
         elif sort_by == "Status":
-            status_map = {"New": 1, "Processing": 2, "Scheduled": 3, "Completed": 4, "Rejected": 5}
-            filtered_requests.sort(key=lambda x: status_map.get(x.get('status'), 0))
+            status_codes = pd.Categorical(df['status'], categories=["New", "Processing", "Scheduled", "Completed", "Rejected"], ordered=True).codes
+            df = df.iloc[np.argsort(status_codes, kind='stable')]
         
-        return filtered_requests
+        return df.index.to_numpy()
+    
+    def sort_and_filter_requests(requests, status_filter, priority_filter, sort_by):
+        order = get_request_order(requests, requests_version(), tuple(status_filter), tuple(priority_filter), sort_by)
+        return [requests[i] for i in order]
     
     # Get filtered and sorted requests
     filtered_requests = sort_and_filter_requests(
@@ -501,38 +771,69 @@ with tab2:
     if not filtered_requests:
         st.warning("No repair requests found matching the selected filters.")
     else:
-        # Display repair requests
-        for i, request in enumerate(filtered_requests):
-            # Create a card for each request
-            st.markdown(f"""
-            <div class="repair-card">
-                <h3>Request ID: {request.get('request_id', 'Unknown')}</h3>
-                <span class="status-badge status-{request.get('status', 'New').lower()}">{request.get('status', 'New')}</span>
-                <p><strong>Pothole ID:</strong> {request.get('pothole_id', 'Unknown')}</p>
-                <p><strong>Location:</strong> ({request.get('latitude', 0):.4f}, {request.get('longitude', 0):.4f})</p>
-                <p><strong>Priority:</strong> {request.get('priority', 'Unknown')}</p>
-                <p><strong>Repair Type:</strong> {request.get('repair_type', 'Unknown')}</p>
-                <p><strong>Submitted:</strong> {request.get('submission_date', 'Unknown')}</p>
-                <p><strong>Expected Completion:</strong> {request.get('expected_completion', 'Unknown')}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Create columns for actions
-            col1, col2, col3 = st.columns([1, 1, 2])
-            
-            with col1:
-                # View details button
-                if st.button(f"View Details", key=f"view_{i}"):
-                    st.session_state.selected_request = request
-            
-            with col2:
-                # Status update button
-                if request.get('status') != 'Completed' and request.get('status') != 'Rejected':
-                    if st.button(f"Update Status", key=f"update_{i}"):
-                        st.session_state.update_request = request
-            
-            # Add a separator
-            st.markdown("---")
+        # Only render one page of requests at a time
+        page_count = math.ceil(len(filtered_requests) / REQUESTS_PAGE_SIZE)
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1) if page_count > 1 else 1
+        page_requests = filtered_requests[(page - 1) * REQUESTS_PAGE_SIZE:page * REQUESTS_PAGE_SIZE]
+        
+        # Display the page's repair request cards as a single element
+        st.markdown(
+            "\n".join(render_request_card(request) for request in page_requests),
+            unsafe_allow_html=True
+        )
+        
+        # One set of actions for the chosen request instead of buttons on every card
+        col1, col2, col3 = st.columns([2, 1, 1])
+        
+        with col1:
+            action_idx = st.selectbox(
+                "Request",
+                options=range(len(page_requests)),
+                format_func=lambda i: page_requests[i].get('request_id', 'Unknown'),
+                key="request_action_select"
+            )
+            action_request = page_requests[action_idx]
+        
+        with col2:
+            # View details button
+            if st.button("View Details", key="view_request_btn"):
+                st.session_state.selected_request = action_request
+        
+        with col3:
+            # Status update button
+            if action_request.get('status') != 'Completed' and action_request.get('status') != 'Rejected':
+                if st.button("Update Status", key="update_request_btn"):
+                    st.session_state.update_request = action_request
+        
+        # Add a separator
+        st.markdown("---")
+    
+    @st.cache_data(show_spinner=False)
+    def build_location_map(latitude, longitude, request_id):
+        """Build the single-location map for a request's detail view."""
+        location_df = pd.DataFrame([{
+            'latitude': latitude,
+            'longitude': longitude,
+            'request_id': request_id
+        }])
+        
+        location_map = px.scatter_mapbox(
+            location_df,
+            lat="latitude",
+            lon="longitude",
+            hover_name="request_id",
+            zoom=15,
+            size=[10],
+            color_discrete_sequence=["#FF4B4B"]
+        )
+        
+        location_map.update_layout(
+            mapbox_style="open-street-map",
+            margin={"r": 0, "t": 0, "l": 0, "b": 0},
+            height=300
+        )
+        
+        return location_map
     
     # Handle selected request for details
     if 'selected_request' in st.session_state:
@@ -569,27 +870,7 @@ with tab2:
         with col2:
             # Show a map with the pothole location
             if 'latitude' in request and 'longitude' in request:
-                location_df = pd.DataFrame([{
-                    'latitude': request['latitude'],
-                    'longitude': request['longitude'],
-                    'request_id': request['request_id']
-                }])
-                
-                location_map = px.scatter_mapbox(
-                    location_df,
-                    lat="latitude",
-                    lon="longitude",
-                    hover_name="request_id",
-                    zoom=15,
-                    size=[10],
-                    color_discrete_sequence=["#FF4B4B"]
-                )
-                
-                location_map.update_layout(
-                    mapbox_style="open-street-map",
-                    margin={"r": 0, "t": 0, "l": 0, "b": 0},
-                    height=300
-                )
+                location_map = build_location_map(request['latitude'], request['longitude'], request['request_id'])
                 
                 st.plotly_chart(location_map, use_container_width=True)
         
@@ -612,45 +893,19 @@ with tab2:
             
             update_notes = st.text_area("Update Notes", placeholder="Enter notes about this status update...")
             
+            scheduled_date = schedule_notes = None
             if new_status == 'Scheduled' and (current_status != 'Scheduled' or not request.get('scheduled_date')):
                 scheduled_date = st.date_input("Scheduled Date", value=datetime.now() + timedelta(days=3))
                 schedule_notes = st.text_input("Schedule Notes", placeholder="Enter any notes about the schedule...")
             
             if st.button("Save Status Update"):
                 # Update the request
-                for req in st.session_state.repair_requests:
-                    if req.get('request_id') == request.get('request_id'):
-                        req['status'] = new_status
-                        req['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        # Add update notes
-                        if update_notes:
-                            if 'update_history' not in req:
-                                req['update_history'] = []
-                            req['update_history'].append({
-                                'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                'from_status': current_status,
-                                'to_status': new_status,
-                                'notes': update_notes
-                            })
-                        
-                        # Add scheduled date if applicable
-                        if new_status == 'Scheduled' and (current_status != 'Scheduled' or not req.get('scheduled_date')):
-                            req['scheduled_date'] = scheduled_date.strftime('%Y-%m-%d')
-                            if schedule_notes:
-                                req['schedule_notes'] = schedule_notes
-                        
-                        # Update expected completion date based on status
-                        if new_status == 'Processing':
-                            req['expected_completion'] = (datetime.now() + timedelta(days=5 if req.get('priority') == 'High' else 10 if req.get('priority') == 'Medium' else 20)).strftime('%Y-%m-%d')
-                        elif new_status == 'Scheduled':
-                            req['expected_completion'] = (datetime.strptime(req['scheduled_date'], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
-                        elif new_status == 'Completed':
-                            req['completion_date'] = datetime.now().strftime('%Y-%m-%d')
-                
-                # Save to file
-                with open(repair_requests_file, 'w') as f:
-                    json.dump(st.session_state.repair_requests, f)
+                req = st.session_state.requests_by_request_id.get(request.get('request_id'))
+                if req is not None:
+                    apply_status_update(req, current_status, new_status, update_notes, scheduled_date, schedule_notes)
+                    
+                    # Queue the save of just this request
+                    mark_repair_requests_changed(req['request_id'])
                 
                 st.success(f"Status updated to {new_status}")
                 
@@ -684,6 +939,7 @@ with tab2:
         
         update_notes = st.text_area("Update Notes", placeholder="Enter notes about this status update...", key="update_notes_area")
         
+        scheduled_date = schedule_notes = None
         if new_status == 'Scheduled' and (current_status != 'Scheduled' or not request.get('scheduled_date')):
             scheduled_date = st.date_input("Scheduled Date", value=datetime.now() + timedelta(days=3), key="update_scheduled_date")
             schedule_notes = st.text_input("Schedule Notes", placeholder="Enter any notes about the schedule...", key="update_schedule_notes")
@@ -693,40 +949,12 @@ with tab2:
         with col1:
             if st.button("Save Status", key="save_status_update_btn"):
                 # Update the request
-                for req in st.session_state.repair_requests:
-                    if req.get('request_id') == request.get('request_id'):
-                        req['status'] = new_status
-                        req['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        # Add update notes
-                        if update_notes:
-                            if 'update_history' not in req:
-                                req['update_history'] = []
-                            req['update_history'].append({
-                                'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                'from_status': current_status,
-                                'to_status': new_status,
-                                'notes': update_notes
-                            })
-                        
-                        # Add scheduled date if applicable
-                        if new_status == 'Scheduled' and (current_status != 'Scheduled' or not req.get('scheduled_date')):
-                            req['scheduled_date'] = scheduled_date.strftime('%Y-%m-%d')
-                            if 'schedule_notes' in locals() and schedule_notes:
-                                req['schedule_notes'] = schedule_notes
-                        
-                        # Update expected completion date based on status
-                        if new_status == 'Processing':
-                            req['expected_completion'] = (datetime.now() + timedelta(days=5 if req.get('priority') == 'High' else 10 if req.get('priority') == 'Medium' else 20)).strftime('%Y-%m-%d')
-                        elif new_status == 'Scheduled':
-                            scheduled_date_str = req.get('scheduled_date', datetime.now().strftime('%Y-%m-%d'))
-                            req['expected_completion'] = (datetime.strptime(scheduled_date_str, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
-                        elif new_status == 'Completed':
-                            req['completion_date'] = datetime.now().strftime('%Y-%m-%d')
-                
-                # Save to file
-                with open(repair_requests_file, 'w') as f:
-                    json.dump(st.session_state.repair_requests, f)
+                req = st.session_state.requests_by_request_id.get(request.get('request_id'))
+                if req is not None:
+                    apply_status_update(req, current_status, new_status, update_notes, scheduled_date, schedule_notes)
+                    
+                    # Queue the save of just this request
+                    mark_repair_requests_changed(req['request_id'])
                 
                 st.success(f"Status updated to {new_status}")
                 
@@ -739,7 +967,7 @@ with tab2:
                 st.session_state.pop('update_request', None)
                 st.rerun()
 
-with tab3:
+if active_tab == "Analytics":
     st.subheader("Repair Request Analytics")
     
     # Check if there are any requests
@@ -747,8 +975,55 @@ with tab3:
         st.warning("No repair requests available for analysis.")
         st.stop()
     
+    @st.cache_data(show_spinner=False)
+    def get_analytics_frame(_requests, version):
+        """Build the analytics DataFrame with parsed submission dates, reused until the requests change."""
+        df = load_requests_frame(_requests, version)
+        if 'submission_date' in df.columns:
+            df['submission_datetime'] = pd.to_datetime(df['submission_date'], format='%Y-%m-%d %H:%M:%S', errors='coerce', cache=True)
+        
+        # Small fixed vocabularies as categoricals so counts and filters work on integer codes
+        for column, categories in (('status', REQUEST_STATUSES), ('priority', REQUEST_PRIORITIES), ('repair_type', REPAIR_TYPES)):
+            if column in df.columns:
+                df[column] = pd.Categorical(df[column], categories=categories)
+        
+        # Narrow the remaining columns: coordinates don't need float64 and IDs go into Arrow-backed strings
+        for column in ('latitude', 'longitude'):
+            if column in df.columns:
+                df[column] = df[column].astype('float32')
+        if 'request_id' in df.columns:
+            df['request_id'] = df['request_id'].astype(pd.StringDtype("pyarrow"))
+        return df
+    
+    @st.cache_data(show_spinner=False)
+    def get_analytics_counts(_requests, version):
+        """Count requests per status, per priority and per submission day once, for every metric and chart."""
+        df = get_analytics_frame(_requests, version)
+        counts = {}
+        for column, categories in (('status', REQUEST_STATUSES), ('priority', REQUEST_PRIORITIES)):
+            codes = df[column].cat.codes.to_numpy() if column in df.columns else np.empty(0, dtype='int8')
+            counts[column] = np.bincount(codes[codes >= 0], minlength=len(categories))
+        
+        submission_days = df['submission_datetime'].to_numpy('datetime64[D]') if 'submission_datetime' in df.columns else np.empty(0, dtype='datetime64[D]')
+        days, day_counts = np.unique(submission_days[~np.isnat(submission_days)], return_counts=True)
+        counts['daily'] = pd.DataFrame({'submission_date_only': days, 'count': day_counts})
+        return counts
+    
     # Create a DataFrame from the repair requests
-    requests_df = pd.DataFrame(st.session_state.repair_requests)
+    requests_df = get_analytics_frame(st.session_state.repair_requests, requests_version())
+    analytics_counts = get_analytics_counts(st.session_state.repair_requests, requests_version())
+    status_counts_array = analytics_counts['status']
+    
+    def analytics_figure(name, build):
+        """Return the named chart for the current requests, only building it after they changed."""
+        version = requests_version()
+        if st.session_state.get('analytics_figures_version') != version:
+            st.session_state.analytics_figures = {}
+            st.session_state.analytics_figures_version = version
+        figures = st.session_state.analytics_figures
+        if name not in figures:
+            figures[name] = build()
+        return figures[name]
     
     # Display summary metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -759,27 +1034,24 @@ with tab3:
     
     with col2:
         if 'status' in requests_df.columns:
-            completed = len(requests_df[requests_df['status'] == 'Completed'])
+            completed = status_counts_array[REQUEST_STATUSES.index('Completed')]
             completion_rate = (completed / total_requests) * 100 if total_requests > 0 else 0
             st.metric("Completion Rate", f"{completion_rate:.1f}%")
     
     with col3:
         if 'priority' in requests_df.columns:
-            high_priority = len(requests_df[requests_df['priority'] == 'High'])
+            high_priority = analytics_counts['priority'][REQUEST_PRIORITIES.index('High')]
             high_priority_pct = (high_priority / total_requests) * 100 if total_requests > 0 else 0
             st.metric("High Priority", f"{high_priority} ({high_priority_pct:.1f}%)")
     
     with col4:
         if 'submission_date' in requests_df.columns:
-            # Convert to datetime
-            requests_df['submission_datetime'] = pd.to_datetime(requests_df['submission_date'])
-            
-            # Calculate average age of open requests
-            open_requests = requests_df[~requests_df['status'].isin(['Completed', 'Rejected'])]
-            if not open_requests.empty:
-                current_time = datetime.now()
-                open_requests['age_days'] = (current_time - open_requests['submission_datetime']).dt.days
-                avg_age = open_requests['age_days'].mean()
+            # Calculate average age of open requests in whole days on the raw datetime64 values
+            open_mask = ~requests_df['status'].isin(['Completed', 'Rejected']).to_numpy()
+            if open_mask.any():
+                submitted = requests_df['submission_datetime'].to_numpy('datetime64[D]')[open_mask]
+                age_days = (np.datetime64(date.today(), 'D') - submitted[~np.isnat(submitted)]).astype('int32')
+                avg_age = age_days.mean() if age_days.size else float('nan')
                 st.metric("Avg Request Age", f"{avg_age:.1f} days")
             else:
                 st.metric("Avg Request Age", "0 days")
@@ -788,200 +1060,228 @@ with tab3:
     st.subheader("Request Status Breakdown")
     
     if 'status' in requests_df.columns:
-        status_counts = requests_df['status'].value_counts().reset_index()
-        status_counts.columns = ['Status', 'Count']
-        
-        # Create pie chart
-        fig = px.pie(
-            status_counts,
-            values='Count',
-            names='Status',
-            title='Request Status Distribution',
-            color='Status',
-            color_discrete_map={
-                'New': '#4b79ff',
-                'Processing': '#FFA500',
-                'Scheduled': '#9932CC',
-                'Completed': '#4CAF50',
-                'Rejected': '#FF4B4B'
-            }
-        )
-        
-        fig.update_layout(
-            legend_title="Status",
-            height=400
-        )
+        def build_status_figure():
+            """Pie chart of the request statuses."""
+            status_counts = pd.DataFrame({'Status': REQUEST_STATUSES, 'Count': status_counts_array})
+            status_counts = status_counts[status_counts['Count'] > 0]
+            
+            # Create pie chart
+            fig = px.pie(
+                status_counts,
+                values='Count',
+                names='Status',
+                title='Request Status Distribution',
+                color='Status',
+                color_discrete_map={
+                    'New': '#4b79ff',
+                    'Processing': '#FFA500',
+                    'Scheduled': '#9932CC',
+                    'Completed': '#4CAF50',
+                    'Rejected': '#FF4B4B'
+                }
+            )
+            
+            fig.update_layout(
+                legend_title="Status",
+                height=400
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(analytics_figure('status', build_status_figure), use_container_width=True)
     
     # Priority vs Status
     st.subheader("Priority vs Status")
     
     if 'status' in requests_df.columns and 'priority' in requests_df.columns:
-        # Create a cross-tabulation
-        priority_status = pd.crosstab(requests_df['priority'], requests_df['status'])
-        
-        # Convert to long format for plotting
-        priority_status_long = priority_status.reset_index().melt(
-            id_vars=['priority'],
-            var_name='status',
-            value_name='count'
-        )
-        
-        # Create grouped bar chart
-        fig = px.bar(
-            priority_status_long,
-            x='priority',
-            y='count',
-            color='status',
-            title='Request Status by Priority',
-            labels={'priority': 'Priority', 'count': 'Number of Requests', 'status': 'Status'},
-            color_discrete_map={
-                'New': '#4b79ff',
-                'Processing': '#FFA500',
-                'Scheduled': '#9932CC',
-                'Completed': '#4CAF50',
-                'Rejected': '#FF4B4B'
-            },
-            category_orders={"priority": ["High", "Medium", "Low"]}
-        )
-        
-        fig.update_layout(
-            xaxis_title="Priority",
-            yaxis_title="Number of Requests",
-            legend_title="Status",
-            height=400
-        )
+        def build_priority_status_figure():
+            """Grouped bar chart of request statuses per priority."""
+            # Count each priority/status pair straight into the long format used for plotting
+            priority_status_long = (
+                requests_df.groupby(['priority', 'status'], observed=True, sort=False)
+                .size()
+                .reset_index(name='count')
+            )
+            
+            # Create grouped bar chart
+            fig = px.bar(
+                priority_status_long,
+                x='priority',
+                y='count',
+                color='status',
+                title='Request Status by Priority',
+                labels={'priority': 'Priority', 'count': 'Number of Requests', 'status': 'Status'},
+                color_discrete_map={
+                    'New': '#4b79ff',
+                    'Processing': '#FFA500',
+                    'Scheduled': '#9932CC',
+                    'Completed': '#4CAF50',
+                    'Rejected': '#FF4B4B'
+                },
+                category_orders={"priority": ["High", "Medium", "Low"]}
+            )
+            
+            fig.update_layout(
+                xaxis_title="Priority",
+                yaxis_title="Number of Requests",
+                legend_title="Status",
+                height=400
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(analytics_figure('priority_status', build_priority_status_figure), use_container_width=True)
     
     # Time-based analysis
     st.subheader("Request Timeline Analysis")
     
     if 'submission_date' in requests_df.columns:
-        # Ensure submission_datetime column exists
-        if 'submission_datetime' not in requests_df.columns:
-            requests_df['submission_datetime'] = pd.to_datetime(requests_df['submission_date'])
-        
-        # Extract date only
-        requests_df['submission_date_only'] = requests_df['submission_datetime'].dt.date
-        
-        # Group by date and count
-        daily_counts = requests_df.groupby('submission_date_only').size().reset_index(name='count')
-        
-        # Create time series chart
-        fig = px.line(
-            daily_counts,
-            x='submission_date_only',
-            y='count',
-            title='Repair Requests Over Time',
-            labels={'submission_date_only': 'Date', 'count': 'Number of Requests'},
-            markers=True
-        )
-        
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Number of Requests",
-            height=400
-        )
+        def build_timeline_figure():
+            """Line chart of requests submitted per day."""
+            # Requests per submission day, counted with the other analytics
+            daily_counts = analytics_counts['daily']
+            
+            # Create time series chart
+            fig = px.line(
+                daily_counts,
+                x='submission_date_only',
+                y='count',
+                title='Repair Requests Over Time',
+                labels={'submission_date_only': 'Date', 'count': 'Number of Requests'},
+                markers=True
+            )
+            
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Number of Requests",
+                height=400
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(analytics_figure('timeline', build_timeline_figure), use_container_width=True)
     
     # Repair type breakdown
     st.subheader("Repair Type Analysis")
     
     if 'repair_type' in requests_df.columns:
-        repair_counts = requests_df['repair_type'].value_counts().reset_index()
-        repair_counts.columns = ['Repair Type', 'Count']
-        
-        # Create bar chart
-        fig = px.bar(
-            repair_counts,
-            x='Repair Type',
-            y='Count',
-            title='Repair Types Requested',
-            color='Repair Type',
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        
-        fig.update_layout(
-            xaxis_title="Repair Type",
-            yaxis_title="Number of Requests",
-            height=400
-        )
+        def build_repair_type_figure():
+            """Bar chart of the requested repair types."""
+            repair_counts = requests_df['repair_type'].value_counts().loc[lambda counts: counts > 0].reset_index()
+            repair_counts.columns = ['Repair Type', 'Count']
+            
+            # Create bar chart
+            fig = px.bar(
+                repair_counts,
+                x='Repair Type',
+                y='Count',
+                title='Repair Types Requested',
+                color='Repair Type',
+                color_discrete_sequence=px.colors.qualitative.Pastel
+            )
+            
+            fig.update_layout(
+                xaxis_title="Repair Type",
+                yaxis_title="Number of Requests",
+                height=400
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(analytics_figure('repair_type', build_repair_type_figure), use_container_width=True)
     
     # Geographical analysis
     st.subheader("Geographical Analysis")
     
     if 'latitude' in requests_df.columns and 'longitude' in requests_df.columns:
-        # Create map with repair requests colored by status
-        map_df = requests_df.copy()
-        
-        # Create a color map for status
-        status_color_map = {
-            'New': '#4b79ff',
-            'Processing': '#FFA500',
-            'Scheduled': '#9932CC',
-            'Completed': '#4CAF50',
-            'Rejected': '#FF4B4B'
-        }
-        
-        # Create map
-        fig = px.scatter_mapbox(
-            map_df,
-            lat="latitude",
-            lon="longitude",
-            color="status" if 'status' in map_df.columns else None,
-            color_discrete_map=status_color_map,
-            size=[10] * len(map_df),
-            zoom=10,
-            hover_name="request_id",
-            hover_data={
-                "priority": True,
-                "status": True,
-                "repair_type": True,
-                "submission_date": True,
-                "latitude": False,
-                "longitude": False
-            },
-            title="Repair Request Map"
-        )
-        
-        fig.update_layout(
-            mapbox_style="open-street-map",
-            margin={"r": 0, "t": 0, "l": 0, "b": 0},
-            height=500,
-            legend_title="Status"
-        )
+        def build_map_figure():
+            """Map of the requests, binned into a density above ANALYTICS_DENSITY_THRESHOLD."""
+            if len(requests_df) > ANALYTICS_DENSITY_THRESHOLD:
+                # Bin the requests on a 64x64 lat/lon histogram and only send the occupied bins
+                located = requests_df[['latitude', 'longitude']].dropna()
+                bin_counts, lat_edges, lon_edges = np.histogram2d(
+                    located['latitude'].to_numpy('float32'), located['longitude'].to_numpy('float32'), bins=64
+                )
+                lat_idx, lon_idx = np.nonzero(bin_counts)
+                density_df = pd.DataFrame({
+                    'latitude': ((lat_edges[lat_idx] + lat_edges[lat_idx + 1]) / 2).astype('float32'),
+                    'longitude': ((lon_edges[lon_idx] + lon_edges[lon_idx + 1]) / 2).astype('float32'),
+                    'count': bin_counts[lat_idx, lon_idx].astype('int32')
+                })
+                
+                fig = px.density_mapbox(
+                    density_df,
+                    lat="latitude",
+                    lon="longitude",
+                    z="count",
+                    radius=20,
+                    zoom=10,
+                    labels={'count': 'Requests'},
+                    title="Repair Request Density"
+                )
+            else:
+                # Create map with repair requests colored by status
+                map_df = requests_df.copy()
+            
+                # Create a color map for status
+                status_color_map = {
+                    'New': '#4b79ff',
+                    'Processing': '#FFA500',
+                    'Scheduled': '#9932CC',
+                    'Completed': '#4CAF50',
+                    'Rejected': '#FF4B4B'
+                }
+            
+                # Create map
+                fig = px.scatter_mapbox(
+                    map_df,
+                    lat="latitude",
+                    lon="longitude",
+                    color="status" if 'status' in map_df.columns else None,
+                    color_discrete_map=status_color_map,
+                    size=[10] * len(map_df),
+                    zoom=10,
+                    hover_name="request_id",
+                    hover_data={
+                        "priority": True,
+                        "status": True,
+                        "repair_type": True,
+                        "submission_date": True,
+                        "latitude": False,
+                        "longitude": False
+                    },
+                    title="Repair Request Map"
+                )
+            
+            fig.update_layout(
+                mapbox_style="open-street-map",
+                margin={"r": 0, "t": 0, "l": 0, "b": 0},
+                height=500,
+                legend_title="Status"
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(analytics_figure('map', build_map_figure), use_container_width=True)
     
     # Expected vs actual completion time
     st.subheader("Completion Time Analysis")
     
     if 'status' in requests_df.columns and 'expected_completion' in requests_df.columns:
-        completed_requests = requests_df[requests_df['status'] == 'Completed'].copy()
-        
-        if not completed_requests.empty and 'completion_date' in completed_requests.columns:
-            # Convert dates to datetime
-            completed_requests['expected_completion_dt'] = pd.to_datetime(completed_requests['expected_completion'])
-            completed_requests['completion_date_dt'] = pd.to_datetime(completed_requests['completion_date'])
+        def build_completion_figures():
+            """Completion time charts, empty when no completed requests have completion dates."""
+            completed_requests = requests_df[requests_df['status'] == 'Completed'].copy()
+            if completed_requests.empty or 'completion_date' not in completed_requests.columns:
+                return []
             
-            # Calculate days difference
-            completed_requests['days_difference'] = (completed_requests['completion_date_dt'] - completed_requests['expected_completion_dt']).dt.days
+            # Convert dates to datetime with the fixed format they are saved in
+            expected_completion_dt = pd.to_datetime(completed_requests['expected_completion'], format='%Y-%m-%d', errors='coerce', cache=True)
+            completion_date_dt = pd.to_datetime(completed_requests['completion_date'], format='%Y-%m-%d', errors='coerce', cache=True)
             
-            # Categorize as early, on time, or late
-            completed_requests['completion_status'] = pd.cut(
-                completed_requests['days_difference'],
-                bins=[-float('inf'), -1, 1, float('inf')],
-                labels=['Early', 'On Time', 'Late']
-            )
+            # Calculate days difference
+            completed_requests['days_difference'] = (completion_date_dt - expected_completion_dt).dt.days.astype('Int16')
             
-            # Count by completion status
-            completion_counts = completed_requests['completion_status'].value_counts().reset_index()
-            completion_counts.columns = ['Completion Status', 'Count']
+            # Categorize as early (<= -1 day), on time (up to 1 day) or late, and count each bucket
+            days_difference = completed_requests['days_difference'].dropna().to_numpy('int16')
+            completion_counts = pd.DataFrame({
+                'Completion Status': ['Early', 'On Time', 'Late'],
+                'Count': count_completion_buckets(days_difference)
+            })
             
             # Create bar chart
             fig = px.bar(
@@ -1004,11 +1304,11 @@ with tab3:
                 height=400
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            figures = [fig]
             
             # Calculate average days difference by priority
             if 'priority' in completed_requests.columns:
-                avg_days_by_priority = completed_requests.groupby('priority')['days_difference'].mean().reset_index()
+                avg_days_by_priority = completed_requests.groupby('priority', observed=True)['days_difference'].mean().reset_index()
                 avg_days_by_priority.columns = ['Priority', 'Average Days Difference']
                 
                 # Create bar chart
@@ -1028,6 +1328,12 @@ with tab3:
                     height=400
                 )
                 
+                figures.append(fig)
+            return figures
+        
+        completion_figures = analytics_figure('completion', build_completion_figures)
+        if completion_figures:
+            for fig in completion_figures:
                 st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No completed requests with completion dates available for analysis.")
@@ -1049,10 +1355,12 @@ This system streamlines the process from detection to repair, helping make roads
 """)
 
 # Show animated mascot
-st.markdown(load_mascot_animation(), unsafe_allow_html=True)
 st.markdown("""
 <div class="mascot-container">
     <div class="mascot-speech">Need help with road repairs? I'm here to assist! Just let me know which potholes need fixing.</div>
     <div class="mascot-bounce">🕵️</div>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Write any repair request changes made during this run in a single save
+flush_repair_requests()
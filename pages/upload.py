@@ -1,17 +1,18 @@
 import streamlit as st
 import os
 import numpy as np
+import pandas as pd
 import time
 import io
 import cv2
-from PIL import Image
 from datetime import datetime
 import sys
 import uuid
+import hashlib
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.detection import PotholeDetector
+from utils.detection import get_detector
 from utils.visualization import draw_bounding_boxes, encode_image_to_base64
 from utils.data_processing import save_processed_image
 from utils.tutorial import get_tutorial_manager
@@ -33,10 +34,6 @@ st.title("📤 Upload & Detect")
 st.markdown("Upload an image to detect potholes using YOLOv8 model.")
 
 # Initialize the detector
-@st.cache_resource
-def get_detector():
-    return PotholeDetector()
-
 detector = get_detector()
 
 # Layout with two columns
@@ -84,63 +81,90 @@ with col1:
 
     # Process the image
     if uploaded_file is not None:
-        # Create a unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        original_filename = uploaded_file.name
-        unique_filename = f"{os.path.splitext(original_filename)[0]}_{timestamp}"
+        # Reruns with the same image and threshold, e.g. from other widgets, reuse the earlier result.
+        # The upload is already held in memory, so hash, decode and save through a view of its buffer
+        image_bytes = uploaded_file.getbuffer()
+        detection_key = (hashlib.sha1(image_bytes).digest(), confidence_threshold)
+        detection_cache = st.session_state.setdefault('upload_detections', {})
+        
+        if detection_key in detection_cache:
+            st.session_state.last_detection = detection_cache[detection_key]
+            st.success(f"Processed image with {len(st.session_state.last_detection['detections'])} pothole detections!")
+        else:
+            # Create a unique filename
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            original_filename = uploaded_file.name
+            unique_filename = f"{os.path.splitext(original_filename)[0]}_{timestamp}"
         
-        # Status message
-        status_message = st.empty()
-        status_message.info("Processing image...")
+            # Status message
+            status_message = st.empty()
+            status_message.info("Processing image...")
         
-        try:
-            # Read the image
-            image_bytes = uploaded_file.getvalue()
-            image = Image.open(io.BytesIO(image_bytes))
-            image_np = np.array(image)
+            try:
+                # Decode the image once with OpenCV, the detector works on the decoded array
+                image_bgr = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if image_bgr is None:
+                    raise ValueError("Could not decode the image file")
+                image_np = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
             
-            # Detect potholes
-            image_rgb, detections, metadata = detector.detect_potholes(
-                io.BytesIO(image_bytes), 
-                conf_threshold=confidence_threshold
-            )
+                # Detect potholes, large photos are shrunk to the model input size up front
+                image_rgb, detections, metadata = detector.detect_potholes(
+                    image_np, 
+                    conf_threshold=confidence_threshold,
+                    imgsz=detector.input_size
+                )
             
-            # Save results
-            with st.spinner("Saving results..."):
-                # Save original image
-                uploads_dir = "data/uploads"
-                os.makedirs(uploads_dir, exist_ok=True)
-                original_path = os.path.join(uploads_dir, f"{unique_filename}.jpg")
+                # Save results
+                with st.spinner("Saving results..."):
+                    # Save original image
+                    uploads_dir = "data/uploads"
+                    os.makedirs(uploads_dir, exist_ok=True)
+                    original_path = os.path.join(uploads_dir, f"{unique_filename}.jpg")
                 
-                with open(original_path, "wb") as f:
-                    f.write(image_bytes)
+                    with open(original_path, "wb") as f:
+                        f.write(image_bytes)
                 
-                # Save detection results
-                if image_rgb is not None:
-                    # Draw bounding boxes
-                    image_with_boxes = draw_bounding_boxes(image_rgb, detections, min_confidence=confidence_threshold)
+                    # Save detection results
+                    if image_rgb is not None:
+                        # Draw bounding boxes
+                        image_with_boxes = draw_bounding_boxes(image_rgb, detections, min_confidence=confidence_threshold)
+                        
+                        # Encode to JPEG once, the same bytes are saved and displayed
+                        _, encoded_image = cv2.imencode(
+                            '.jpg',
+                            cv2.cvtColor(image_with_boxes, cv2.COLOR_RGB2BGR),
+                            [int(cv2.IMWRITE_JPEG_QUALITY), 85]
+                        )
+                        encoded_image = encoded_image.tobytes()
+                    
+                        # Save the processed image and results
+                        image_path, json_path = detector.save_results(
+                            image_with_boxes,
+                            detections,
+                            metadata,
+                            unique_filename,
+                            output_dir="data/results",
+                            encoded_image=encoded_image
+                        )
                     
-                    # Save the processed image and results
-                    image_path, json_path = detector.save_results(
-                        image_with_boxes,
-                        detections,
-                        metadata,
-                        unique_filename,
-                        output_dir="data/results"
-                    )
+                        st.session_state.last_detection = {
+                            'image_path': image_path,
+                            'json_path': json_path,
+                            'image': encoded_image,
+                            'detections': detections,
+                            'metadata': metadata
+                        }
                     
-                    st.session_state.last_detection = {
-                        'image_path': image_path,
-                        'json_path': json_path,
-                        'detections': detections,
-                        'metadata': metadata
-                    }
+                        # Only keep results for the current image, one entry per threshold tried on it
+                        if any(key[0] != detection_key[0] for key in detection_cache):
+                            detection_cache.clear()
+                        detection_cache[detection_key] = st.session_state.last_detection
                 
-            status_message.success(f"Processed image with {len(detections)} pothole detections!")
+                status_message.success(f"Processed image with {len(detections)} pothole detections!")
             
-        except Exception as e:
-            status_message.error(f"Error processing image: {e}")
-            st.stop()
+            except Exception as e:
+                status_message.error(f"Error processing image: {e}")
+                st.stop()
 
 with col2:
     # Display results
@@ -149,11 +173,13 @@ with col2:
     if uploaded_file is not None and 'last_detection' in st.session_state:
         last_detection = st.session_state.last_detection
         
-        # Display the processed image
+        # Display the processed image, from the encoded JPEG when it was kept with the result
         image_path = last_detection['image_path']
-        if os.path.exists(image_path):
-            image = cv2.imread(image_path)
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        if last_detection.get('image') is not None:
+            st.image(last_detection['image'], caption="Processed Image with Detections", use_column_width=True)
+        elif os.path.exists(image_path):
+            # Reverse the channel axis as a view instead of converting into a new buffer
+            image = cv2.imread(image_path, cv2.IMREAD_COLOR)[..., ::-1]
             st.image(image, caption="Processed Image with Detections", use_column_width=True)
         
         # Display detection details
@@ -161,16 +187,23 @@ with col2:
         if detections:
             st.write(f"**Found {len(detections)} potholes:**")
             
-            # Create a table for the detections
-            detection_data = []
-            for i, det in enumerate(detections):
-                detection_data.append({
-                    "ID": i+1,
-                    "Confidence": f"{det['confidence']:.2f}",
-                    "Position": f"({det['bbox'][0]}, {det['bbox'][1]}, {det['bbox'][2]}, {det['bbox'][3]})"
-                })
+            # Create a table for the detections from typed column arrays
+            bboxes = np.array([det['bbox'] for det in detections], dtype=np.int32)
+            detection_data = pd.DataFrame({
+                "ID": np.arange(1, len(detections) + 1, dtype=np.int32),
+                "Confidence": np.fromiter((det['confidence'] for det in detections), dtype=np.float32, count=len(detections)),
+                "X1": bboxes[:, 0],
+                "Y1": bboxes[:, 1],
+                "X2": bboxes[:, 2],
+                "Y2": bboxes[:, 3]
+            })
             
-            st.table(detection_data)
+            st.dataframe(
+                detection_data,
+                column_config={'Confidence': st.column_config.NumberColumn(format='%.2f')},
+                hide_index=True,
+                use_container_width=True
+            )
             
             # Display metadata
             metadata = last_detection['metadata']
@@ -6,19 +6,23 @@ import cv2
 import time
 import numpy as np
 from datetime import datetime
-import glob
+import re
+import shutil
+import subprocess
+import queue
+import threading
 from pathlib import Path
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.detection import PotholeDetector
+from utils.detection import get_detector
 from utils.visualization import draw_bounding_boxes
 from utils.tutorial import get_tutorial_manager
 from utils.data_processing import DATABASE_AVAILABLE
 
 # Try to import database functions if available
 if DATABASE_AVAILABLE:
-    from utils.database import save_detection_to_db
+    from utils.database import save_detections_bulk
 
 st.set_page_config(
     page_title="Video Processing - Pothole Detection System",
@@ -37,15 +41,203 @@ st.title("🎥 Real-Time Video Processing")
 st.markdown("Process video files or webcam feed to detect potholes in real-time.")
 
 # Initialize detector
-@st.cache_resource
-def get_detector():
-    return PotholeDetector()
-
 detector = get_detector()
 
+# Hardware decoding through GStreamer is only possible when OpenCV was built with it
+GSTREAMER_AVAILABLE = re.search(r"GStreamer:\s*YES", cv2.getBuildInformation()) is not None
+
+# FFmpeg is only used to build the demo video, OpenCV writes it frame by frame without it
+FFMPEG_PATH = shutil.which("ffmpeg")
+
+def open_video_capture(video_path):
+    """Open a video file, decoding H.264 on the GPU through GStreamer when available, else with FFmpeg."""
+    if GSTREAMER_AVAILABLE:
+        # Desktop NVDEC decoder from the nvcodec plugin, the same plugin as the NVENC writer below.
+        # A file is decoded as fast as it is consumed: no clock sync and no dropped frames,
+        # the bounded frame queue provides the back-pressure
+        pipeline = (
+            f'filesrc location="{video_path}" ! qtdemux ! h264parse ! nvh264dec ! '
+            "videoconvert ! video/x-raw,format=BGR ! appsink sync=false"
+        )
+        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            return cap
+        cap.release()
+    
+    # Software decoding, e.g. without an NVIDIA decoder or for containers other than MP4/MOV
+    return cv2.VideoCapture(video_path)
+
+def open_video_writer(output_path, fps, frame_size):
+    """Open an MP4 writer, encoding H.264 with NVENC through GStreamer when available, else with mp4v."""
+    if GSTREAMER_AVAILABLE:
+        pipeline = (
+            "appsrc ! videoconvert ! video/x-raw,format=NV12 ! nvh264enc preset=low-latency ! "
+            f'h264parse ! mp4mux ! filesink location="{output_path}"'
+        )
+        writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, frame_size, True)
+        if writer.isOpened():
+            return writer
+        writer.release()
+    
+    # Software MPEG-4 encoding
+    fourcc = cv2.VideoWriter_fourcc('m', 'p', '4', 'v')
+    return cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+
+def write_slideshow_video(image_paths, output_path, frame_size, seconds_per_image=5, fps=2):
+    """
+    Encode a slideshow of still images into an H.264 MP4 with FFmpeg.
+    
+    Each image is decoded once and held for its duration by the concat demuxer,
+    so the repeated frames cost almost nothing to encode.
+    
+    Args:
+        image_paths: Paths of the images, in order
+        output_path: Path of the video to write
+        frame_size: (width, height) of the video
+        seconds_per_image: How long each image is shown
+        fps: Frame rate of the video
+        
+    Returns:
+        True if the video was written, False otherwise
+    """
+    if not FFMPEG_PATH or not image_paths:
+        return False
+    
+    def concat_entry(image_path):
+        return "file '{}'\n".format(os.path.abspath(image_path).replace("'", "'\\''"))
+    
+    # The last image is listed again, the concat demuxer ignores the final duration otherwise
+    concat_list = "".join(f"{concat_entry(path)}duration {seconds_per_image}\n" for path in image_paths)
+    concat_list += concat_entry(image_paths[-1])
+    
+    # H.264 with 4:2:0 chroma needs even dimensions
+    width, height = frame_size[0] // 2 * 2, frame_size[1] // 2 * 2
+    
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as list_file:
+        list_file.write(concat_list)
+    try:
+        result = subprocess.run(
+            [
+                FFMPEG_PATH, "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", list_file.name,
+                "-vf", f"scale={width}:{height},fps={fps},format=yuv420p",
+                "-c:v", "libx264", "-preset", "veryfast",
+                output_path
+            ],
+            capture_output=True
+        )
+        return result.returncode == 0 and os.path.exists(output_path)
+    except OSError as e:
+        print(f"Error running ffmpeg: {e}")
+        return False
+    finally:
+        os.unlink(list_file.name)
+
+@st.cache_data(show_spinner=False)
+def get_video_info(video_path, mtime):
+    """
+    Probe a video's resolution, frame rate and frame count.
+    
+    Args:
+        video_path: Path to the video file
+        mtime: Modification time of the file, so a changed file is probed again
+        
+    Returns:
+        Dictionary with width, height, fps and frame_count, or None if the video cannot be opened
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return None
+        return {
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': int(cap.get(cv2.CAP_PROP_FPS)),
+            'frame_count': int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        }
+    finally:
+        cap.release()
+
+@st.cache_data(show_spinner=False)
+def list_files(directory, extensions, mtime):
+    """
+    List the files in a directory with one of the given extensions.
+    
+    Args:
+        directory: Directory to scan
+        extensions: Tuple of file extensions, e.g. ('.jpg', '.png')
+        mtime: Modification time of the directory, so added or removed files are picked up
+        
+    Returns:
+        Sorted list of file paths
+    """
+    with os.scandir(directory) as entries:
+        return sorted(entry.path for entry in entries if entry.name.endswith(extensions) and entry.is_file())
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_video_bytes(video_path, mtime):
+    """
+    Read a processed video for download once instead of on every rerun.
+    
+    The bytes are immutable, so they are shared rather than copied out of the
+    cache on each call. Only the latest video is kept in memory.
+    
+    Args:
+        video_path: Path to the video file
+        mtime: Modification time of the file, so a rewritten video is read again
+        
+    Returns:
+        The file contents as bytes
+    """
+    with open(video_path, 'rb') as video_file:
+        return video_file.read()
+
+def read_frames(cap, frame_queue, stop_event, every_n=1):
+    """
+    Decode every Nth frame from a capture into a bounded queue on a worker thread.
+    
+    Skipped frames are only grabbed, not decoded into an image. Queue items are
+    (frame index, frame) tuples, and None marks the end of the video. The end
+    marker is also queued when decoding fails, so the consumer never waits forever.
+    """
+    def put(item):
+        # Wait for room in the queue, giving up once the consumer has stopped
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+    
+    frame_idx = 0
+    try:
+        while not stop_event.is_set():
+            if frame_idx % every_n:
+                # Advance past a skipped frame without decoding it
+                if not cap.grab():
+                    break
+                frame_idx += 1
+                continue
+            
+            success, frame = cap.read()
+            if not success:
+                break
+            put((frame_idx, frame))
+            frame_idx += 1
+    except Exception as e:
+        print(f"Error decoding video frames: {e}")
+    finally:
+        put(None)
+
 # Create tabs for different video sources
 tab1, tab2, tab3 = st.tabs(["Video Upload", "Webcam", "Results"])
 
+# Sampled frames sent to the detector together
+VIDEO_BATCH_SIZE = 16
+
+# Minimum seconds between progress and preview updates, each one is a round trip to the browser
+UI_UPDATE_INTERVAL = 0.2
+
 # Directory setup
 output_dir = "data/video_results"
 os.makedirs(output_dir, exist_ok=True)
@@ -71,31 +263,33 @@ with tab1:
             
             # Use sample images to create a video
             sample_images_dir = "data/sample_images"
-            sample_images = glob.glob(os.path.join(sample_images_dir, "*.jpg")) + glob.glob(os.path.join(sample_images_dir, "*.png"))
+            sample_images = []
+            if os.path.isdir(sample_images_dir):
+                sample_images = list_files(sample_images_dir, ('.jpg', '.png'), os.path.getmtime(sample_images_dir))
             
             if sample_images:
                 # Read first image to get dimensions
                 first_img = cv2.imread(sample_images[0])
                 height, width = first_img.shape[:2]
                 
-                # Create a video from the sample images
-                fourcc = cv2.VideoWriter_fourcc('m', 'p', '4', 'v')
-                demo_video = cv2.VideoWriter(demo_video_path, fourcc, 2.0, (width, height))
-                
-                # Add each image multiple times to create a longer video
-                for img_path in sample_images:
-                    img = cv2.imread(img_path)
-                    # Add each frame 10 times (5 seconds per image at 2 FPS)
-                    for _ in range(10):
-                        demo_video.write(img)
-                
-                demo_video.release()
+                # Create a video from the sample images, 5 seconds per image at 2 FPS
+                if not write_slideshow_video(sample_images, demo_video_path, (width, height)):
+                    fourcc = cv2.VideoWriter_fourcc('m', 'p', '4', 'v')
+                    demo_video = cv2.VideoWriter(demo_video_path, fourcc, 2.0, (width, height))
+                    
+                    # Without FFmpeg every repeated frame has to be encoded again
+                    for img_path in sample_images:
+                        img = cv2.imread(img_path)
+                        for _ in range(10):
+                            demo_video.write(img)
+                    
+                    demo_video.release()
                 st.success("Demo video created successfully!")
             else:
                 st.warning("No sample images found to create a demo video.")
         
         # List available demo videos
-        demo_videos = glob.glob(os.path.join(sample_dir, "*.mp4"))
+        demo_videos = list_files(sample_dir, ('.mp4',), os.path.getmtime(sample_dir))
         
         if demo_videos:
             selected_demo = st.selectbox(
@@ -111,12 +305,12 @@ with tab1:
             video_path = selected_demo
             
             # Video info
-            vid_cap = cv2.VideoCapture(video_path)
-            if vid_cap.isOpened():
-                frame_width = int(vid_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                frame_height = int(vid_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                fps = int(vid_cap.get(cv2.CAP_PROP_FPS))
-                frame_count = int(vid_cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            video_info = get_video_info(video_path, os.path.getmtime(video_path))
+            if video_info is not None:
+                frame_width = video_info['width']
+                frame_height = video_info['height']
+                fps = video_info['fps']
+                frame_count = video_info['frame_count']
                 duration = frame_count / fps if fps > 0 else 0
                 
                 st.write(f"**Video Information:**")
@@ -124,7 +318,6 @@ with tab1:
                 st.write(f"- FPS: {fps}")
                 st.write(f"- Duration: {duration:.2f} seconds")
                 st.write(f"- Total Frames: {frame_count}")
-                vid_cap.release()
         else:
             st.warning("No demo videos available. Try uploading sample images first.")
     else:
@@ -136,24 +329,33 @@ with tab1:
         # Process the selected demo video
         process_video = True
     elif uploaded_file is not None:
-        # Save uploaded video to temp file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
-        temp_file.write(uploaded_file.read())
-        video_path = temp_file.name
+        # Save uploaded video to a temp file once per upload rather than on every rerun
+        uploaded_video = st.session_state.get('uploaded_video')
+        if (uploaded_video is None or uploaded_video['file_id'] != uploaded_file.file_id
+                or not os.path.exists(uploaded_video['path'])):
+            if uploaded_video is not None and os.path.exists(uploaded_video['path']):
+                os.unlink(uploaded_video['path'])
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as temp_file:
+                temp_file.write(uploaded_file.getbuffer())
+            uploaded_video = {'file_id': uploaded_file.file_id, 'path': temp_file.name}
+            st.session_state.uploaded_video = uploaded_video
+        video_path = uploaded_video['path']
         
-        # Video information
-        vid_cap = cv2.VideoCapture(video_path)
-        frame_width = int(vid_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        frame_height = int(vid_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = int(vid_cap.get(cv2.CAP_PROP_FPS))
-        frame_count = int(vid_cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        # Video information, probed once per file
+        video_info = get_video_info(video_path, os.path.getmtime(video_path)) or {
+            'width': 0, 'height': 0, 'fps': 0, 'frame_count': 0
+        }
+        frame_width = video_info['width']
+        frame_height = video_info['height']
+        fps = video_info['fps']
+        frame_count = video_info['frame_count']
         duration = frame_count / fps if fps > 0 else 0
         
         st.write(f"**Video Information:**")
         st.write(f"- Resolution: {frame_width}x{frame_height}")
         st.write(f"- FPS: {fps}")
         st.write(f"- Duration: {duration:.2f} seconds")
-        st.write(f"- Total Frames: {frame_count}")
+        st.write(f"- Total Frames: {frame_count if frame_count > 0 else 'Unknown'}")
         
         # Video processing settings
         st.subheader("Processing Settings")
@@ -194,6 +396,15 @@ with tab1:
                 help="Store detection results in the database"
             )
         
+        with st.expander("Advanced Settings"):
+            inference_sizes = [320, 416, 640, 960, 1280]
+            inference_size = st.selectbox(
+                "Inference Size",
+                options=inference_sizes,
+                index=inference_sizes.index(detector.input_size),
+                help="Longest side frames are shrunk to before detection, smaller is faster but may miss small potholes"
+            )
+        
         # Process the video
         if st.button("Process Video", type="primary"):
             # Progress tracking
@@ -208,9 +419,8 @@ with tab1:
             output_filename = f"pothole_detection_{timestamp}.mp4"
             output_path = os.path.join(output_dir, output_filename)
             
-            # Create VideoWriter object
-            fourcc = cv2.VideoWriter_fourcc('m', 'p', '4', 'v')
-            out = cv2.VideoWriter(output_path, fourcc, fps, (frame_width, frame_height))
+            # Create VideoWriter object, only the processed frames are written so the frame rate drops to match
+            out = open_video_writer(output_path, fps / process_every_n_frame, (frame_width, frame_height))
             
             # Process the video
             frame_idx = 0
@@ -218,17 +428,16 @@ with tab1:
             total_detections = 0
             detection_frames = []
             
-            # Read the first frame to verify
-            vid_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            success, frame = vid_cap.read()
+            # Open the video for decoding only once processing starts
+            vid_cap = open_video_capture(video_path)
             
-            if not success:
+            # Check the video is readable from the probed metadata rather than decoding and rewinding
+            if not vid_cap.isOpened() or frame_width <= 0 or frame_height <= 0:
                 st.error("Failed to read the video file.")
+                vid_cap.release()
+                out.release()
                 os.unlink(video_path)  # Clean up temp file
                 st.stop()
-            
-            # Reset to beginning for processing
-            vid_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
             start_time = time.time()
             
             # Display a placeholder for the current frame being processed
@@ -236,103 +445,121 @@ with tab1:
             
             # Store results for later display
             all_results = []
+            db_rows = []
+            
+            # Decode frames ahead on a worker thread so decoding overlaps detection
+            frame_queue = queue.Queue(maxsize=32)
+            reader_stop = threading.Event()
+            frame_reader = threading.Thread(
+                target=read_frames,
+                args=(vid_cap, frame_queue, reader_stop, process_every_n_frame),
+                daemon=True
+            )
+            frame_reader.start()
             
             try:
+                # Sampled frames waiting for detection, with their frame indices
+                batch_frames = []
+                batch_indices = []
+                last_ui_update = 0.0
+                
                 while True:
-                    # Read frame
-                    success, frame = vid_cap.read()
-                    if not success:
-                        break
+                    # Read the next sampled frame
+                    item = frame_queue.get()
+                    success = item is not None
                     
-                    # Update progress
-                    progress = frame_idx / frame_count
-                    progress_bar.progress(progress)
-                    
-                    # Process every N frames
-                    if frame_idx % process_every_n_frame == 0:
-                        # Convert frame for processing
-                        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        
-                        # Use detector on the frame
-                        status_text.text(f"Processing frame {frame_idx}/{frame_count}...")
-                        
-                        # Show the current frame being processed (downscaled if needed)
-                        if frame_width > 640:
-                            display_scale = 640 / frame_width
-                            display_frame = cv2.resize(frame_rgb, (0, 0), fx=display_scale, fy=display_scale)
-                        else:
-                            display_frame = frame_rgb
+                    if success:
+                        frame_idx, frame = item
                         
-                        current_frame_placeholder.image(display_frame, caption=f"Processing frame {frame_idx}", use_container_width=True)
-                        
-                        # Create a temp file for the frame
-                        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_frame:
-                            cv2.imwrite(temp_frame.name, frame)
-                            frame_path = temp_frame.name
-                        
-                        # Detect potholes in the frame
-                        processed_frame, detections, metadata = detector.detect_potholes(
-                            frame_path,
-                            conf_threshold=confidence_threshold
-                        )
+                        # Frames stay in OpenCV's BGR order all the way through
+                        batch_frames.append(frame)
+                        batch_indices.append(frame_idx)
                         
-                        # Remove the temp frame file
-                        os.unlink(frame_path)
-                        
-                        # Draw bounding boxes on frame
-                        if detections:
-                            total_detections += len(detections)
+                        # Refresh progress and preview a few times a second rather than for every frame
+                        now = time.time()
+                        if now - last_ui_update >= UI_UPDATE_INTERVAL:
+                            last_ui_update = now
                             
-                            # Convert processed frame back to BGR for saving
-                            processed_frame_bgr = cv2.cvtColor(processed_frame, cv2.COLOR_RGB2BGR)
+                            # Update progress, when the capture knows its frame count
+                            if frame_count > 0:
+                                progress = min(frame_idx / frame_count, 1.0)
+                                progress_bar.progress(progress)
                             
-                            # Save frame with detections if requested
-                            if save_frames:
-                                frame_filename = f"frame_{frame_idx:06d}.jpg"
-                                frame_save_path = os.path.join(frames_dir, frame_filename)
-                                cv2.imwrite(frame_save_path, processed_frame_bgr)
-                                detection_frames.append(frame_save_path)
+                            status_text.text(f"Processing frame {frame_idx}/{frame_count}...")
                             
-                            # Save to database if requested
-                            if save_to_database and DATABASE_AVAILABLE:
-                                try:
-                                    frame_filename = f"video_frame_{timestamp}_{frame_idx:06d}.jpg"
-                                    # Save the frame temporarily for database
-                                    temp_frame_path = os.path.join(frames_dir, frame_filename)
-                                    cv2.imwrite(temp_frame_path, processed_frame_bgr)
-                                    
-                                    # Add to database
-                                    image_id = save_detection_to_db(temp_frame_path, detections, metadata)
+                            # Show the current frame being processed (downscaled if needed)
+                            if frame_width > 640:
+                                display_scale = 640 / frame_width
+                                display_frame = cv2.resize(frame, (0, 0), fx=display_scale, fy=display_scale)
+                            else:
+                                display_frame = frame
+                            
+                            current_frame_placeholder.image(display_frame, caption=f"Processing frame {frame_idx}", channels="BGR", use_container_width=True)
+                    
+                    # Detect on the sampled frames in one batch once it is full or the video ended
+                    if batch_frames and (not success or len(batch_frames) >= VIDEO_BATCH_SIZE):
+                        batch_results = detector.detect_potholes_batch(
+                            batch_frames,
+                            conf_threshold=confidence_threshold,
+                            imgsz=inference_size
+                        )
+                        
+                        # Write the frames out in their original order
+                        for pending_idx, pending_frame, (processed_frame, detections, metadata) in zip(batch_indices, batch_frames, batch_results):
+                            # Draw bounding boxes on frame
+                            if detections:
+                                total_detections += len(detections)
+                                
+                                # Save the frame with detections once, shared by the frame gallery and the database
+                                save_to_db = save_to_database and DATABASE_AVAILABLE
+                                if save_frames or save_to_db:
+                                    frame_filename = f"video_frame_{timestamp}_{pending_idx:06d}.jpg"
+                                    frame_save_path = os.path.join(frames_dir, frame_filename)
+                                    cv2.imwrite(frame_save_path, processed_frame)
+                                
+                                if save_frames:
+                                    detection_frames.append(frame_save_path)
+                                
+                                # Queue for the database if requested, saved in one transaction after the loop
+                                if save_to_db:
+                                    db_rows.append((frame_save_path, detections, metadata))
                                     
                                     # Keep track of this frame and its detections
                                     all_results.append({
-                                        'frame_idx': frame_idx,
-                                        'frame_path': temp_frame_path,
+                                        'frame_idx': pending_idx,
+                                        'frame_path': frame_save_path,
                                         'detections': detections,
                                         'timestamp': time.time()
                                     })
-                                except Exception as e:
-                                    st.warning(f"Database error: {e}")
+                                
+                                # Write processed frame to output video
+                                out.write(processed_frame)
+                            else:
+                                # Write original frame to output video
+                                out.write(pending_frame)
                             
-                            # Write processed frame to output video
-                            out.write(processed_frame_bgr)
-                        else:
-                            # Write original frame to output video
-                            out.write(frame)
+                            processed_count += 1
                         
-                        processed_count += 1
-                    else:
-                        # Write original frame without processing
-                        out.write(frame)
+                        batch_frames = []
+                        batch_indices = []
                     
-                    # Next frame
-                    frame_idx += 1
+                    if not success:
+                        break
                 
                 # Complete
                 progress_bar.progress(1.0)
                 out.release()
                 vid_cap.release()
                 
+                # Save all detection frames to the database at once
+                if db_rows:
+                    try:
+                        with st.spinner("Saving detections to database..."):
+                            if not save_detections_bulk(db_rows):
+                                st.warning("Database error: detections could not be saved")
+                    except Exception as e:
+                        st.warning(f"Database error: {e}")
+                
                 # Calculate processing stats
                 elapsed_time = time.time() - start_time
                 fps_processing = processed_count / elapsed_time if elapsed_time > 0 else 0
@@ -379,6 +606,10 @@ with tab1:
                 st.error(f"Error processing video: {e}")
             
             finally:
+                # Stop the reader thread before releasing the capture it reads from
+                reader_stop.set()
+                frame_reader.join(timeout=1)
+                
                 # Clean up
                 if 'out' in locals() and out is not None:
                     out.release()
@@ -432,12 +663,14 @@ with tab2:
         video_placeholder = st.empty()
         status_text = st.empty()
         
-        # Stop button
-        stop_button_placeholder = st.empty()
-        stop_pressed = stop_button_placeholder.button("Stop Webcam")
+        # Stop button, rendered once; its callback flags the loop to stop
+        st.session_state.webcam_stop = False
+        st.button("Stop Webcam", on_click=lambda: st.session_state.update(webcam_stop=True))
         
         # Setup webcam capture
         cap = cv2.VideoCapture(0)  # 0 is usually the default webcam
+        # Keep only the newest frame buffered so the feed doesn't lag behind
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         if not cap.isOpened():
             st.error("Failed to open webcam. Please check your camera connection.")
@@ -450,20 +683,20 @@ with tab2:
         # Prepare for saving video
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         video_output_path = os.path.join(output_dir, f"webcam_{timestamp}.mp4")
-        fourcc = cv2.VideoWriter_fourcc('m', 'p', '4', 'v')
-        out = cv2.VideoWriter(video_output_path, fourcc, 20.0, (frame_width, frame_height))
+        out = open_video_writer(video_output_path, 20.0, (frame_width, frame_height))
         
         # Variables for statistics
         frame_count = 0
         detection_count = 0
         start_time = time.time()
+        last_status_update = 0.0
         
         # Store detections for results
         detection_results = []
         
         try:
-            # Process until stop button is pressed
-            while not stop_pressed:
+            # Process until stop button is pressed, cap.read() blocks until the camera delivers a frame
+            while not st.session_state.webcam_stop:
                 # Read frame from webcam
                 ret, frame = cap.read()
                 
@@ -476,66 +709,48 @@ with tab2:
                 
                 # Process every N frames to reduce CPU load
                 if frame_count % process_every_n_frame == 0:
-                    # Save frame to temp file for processing
-                    with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                        cv2.imwrite(temp_file.name, frame)
-                        frame_path = temp_file.name
+                    # Detect on the frame in memory, no temp file round trip
+                    processed_frame, detections, metadata = detector.detect_potholes(
+                        frame,
+                        conf_threshold=confidence_threshold,
+                        imgsz=detector.input_size
+                    )
                     
-                    try:
-                        # Detect potholes
-                        processed_frame, detections, metadata = detector.detect_potholes(
-                            frame_path,
-                            conf_threshold=confidence_threshold
-                        )
-                        
-                        # Update display with processed frame
-                        video_placeholder.image(
-                            processed_frame,
-                            caption="Live Webcam Feed",
-                            use_container_width=True
-                        )
-                        
-                        # Save frame if it contains detections and option is enabled
-                        if detections and save_detections:
-                            detection_count += len(detections)
-                            frame_filename = f"webcam_detection_{timestamp}_{frame_count}.jpg"
-                            detection_path = os.path.join(frames_dir, frame_filename)
-                            
-                            # Convert processed frame back to BGR for saving
-                            processed_frame_bgr = cv2.cvtColor(processed_frame, cv2.COLOR_RGB2BGR)
-                            cv2.imwrite(detection_path, processed_frame_bgr)
-                            
-                            # Add to results
-                            detection_results.append({
-                                'frame': frame_count,
-                                'path': detection_path,
-                                'detections': len(detections),
-                                'timestamp': time.time()
-                            })
+                    # Update display with processed frame
+                    video_placeholder.image(
+                        processed_frame,
+                        caption="Live Webcam Feed",
+                        channels="BGR",
+                        use_container_width=True
+                    )
+                    
+                    # Save frame if it contains detections and option is enabled
+                    if detections and save_detections:
+                        detection_count += len(detections)
+                        frame_filename = f"webcam_detection_{timestamp}_{frame_count}.jpg"
+                        detection_path = os.path.join(frames_dir, frame_filename)
                         
-                        # Write frame to video
-                        processed_frame_bgr = cv2.cvtColor(processed_frame, cv2.COLOR_RGB2BGR)
-                        out.write(processed_frame_bgr)
+                        cv2.imwrite(detection_path, processed_frame)
                         
-                        # Update status
-                        elapsed = time.time() - start_time
+                        # Add to results
+                        detection_results.append({
+                            'frame': frame_count,
+                            'path': detection_path,
+                            'detections': len(detections),
+                            'timestamp': time.time()
+                        })
+                    
+                    # Write frame to video
+                    out.write(processed_frame)
+                    
+                    # Update status, throttled like the video progress
+                    now = time.time()
+                    if now - last_status_update >= UI_UPDATE_INTERVAL:
+                        last_status_update = now
                         status_text.text(
-                            f"Running: {elapsed:.1f}s | Frames: {frame_count} | "
+                            f"Running: {now - start_time:.1f}s | Frames: {frame_count} | "
                             f"Detections: {detection_count}"
                         )
-                    
-                    finally:
-                        # Remove temp file
-                        try:
-                            os.unlink(frame_path)
-                        except Exception:
-                            pass
-                
-                # Check stop button
-                stop_pressed = stop_button_placeholder.button("Stop Webcam", key=f"stop_{frame_count}")
-                
-                # Add a small delay to prevent overwhelming the CPU
-                time.sleep(0.01)
         
         finally:
             # Release resources
@@ -663,14 +878,12 @@ with tab3:
     
     # Option to download the video
     if video_path and os.path.exists(video_path):
-        with open(video_path, 'rb') as video_file:
-            video_bytes = video_file.read()
-            st.download_button(
-                label="Download Processed Video",
-                data=video_bytes,
-                file_name=os.path.basename(video_path),
-                mime="video/mp4"
-            )
+        st.download_button(
+            label="Download Processed Video",
+            data=load_video_bytes(video_path, os.path.getmtime(video_path)),
+            file_name=os.path.basename(video_path),
+            mime="video/mp4"
+        )
     
     # Option to clear results
     if st.button("Clear Results"):
@@ -18,6 +18,36 @@ try:
 except ImportError:
     DATABASE_AVAILABLE = False
 
+# Density-based hotspot clustering is optional
+try:
+    from sklearn.cluster import DBSCAN
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+# GPU clustering through RAPIDS cuML is optional as well
+try:
+    from cuml.cluster import DBSCAN as CumlDBSCAN
+    CUML_AVAILABLE = True
+except ImportError:
+    CUML_AVAILABLE = False
+
+# JIT-compiled loops through Numba are optional
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Mean Earth radius, used to convert meters to haversine radians
+EARTH_RADIUS_M = 6_371_000
+
+# Below this many points the GPU transfer costs more than CPU clustering
+GPU_CLUSTER_MIN_POINTS = 10_000
+
+# Below this many values the NumPy path is as fast as the compiled loop
+NUMBA_MIN_VALUES = 100_000
+
 def load_detection_results(results_dir="data/results"):
     """
     Load all detection results from the results directory.
@@ -267,3 +297,123 @@ def prepare_batch_results(batch_results):
         ])
         
     return df
+
+def label_hotspots(latitude, longitude, eps_meters=500, min_samples=3):
+    """
+    Assign a hotspot cluster label to each geotagged point.
+    
+    Uses DBSCAN with the haversine metric on a BallTree when scikit-learn is
+    installed, or for large point sets the equivalent cuML DBSCAN on the GPU when
+    RAPIDS is installed, and otherwise falls back to a 0.1 degree
+    latitude/longitude grid.
+    
+    Args:
+        latitude: array of latitudes in degrees
+        longitude: array of longitudes in degrees
+        eps_meters: DBSCAN neighbourhood radius in meters
+        min_samples: minimum number of points in a DBSCAN dense region
+        
+    Returns:
+        numpy array of integer cluster labels, one per point
+    """
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    
+    if CUML_AVAILABLE and len(latitude) >= GPU_CLUSTER_MIN_POINTS:
+        try:
+            # Same neighbourhoods as the haversine DBSCAN below: points on the unit sphere
+            # are within eps_meters of each other exactly when their chord is within this.
+            # Kept in float64, the chords are tiny next to the unit vectors
+            lat_rad = np.radians(latitude)
+            lon_rad = np.radians(longitude)
+            coords = np.column_stack([
+                np.cos(lat_rad) * np.cos(lon_rad),
+                np.cos(lat_rad) * np.sin(lon_rad),
+                np.sin(lat_rad)
+            ])
+            chord_eps = 2 * np.sin(eps_meters / (2 * EARTH_RADIUS_M))
+            labels = np.asarray(
+                CumlDBSCAN(eps=chord_eps, min_samples=min_samples).fit_predict(coords)
+            ).astype(np.int64)
+            
+            # Keep noise points as their own single-point hotspots
+            noise = labels == -1
+            labels[noise] = labels.max() + 1 + np.arange(noise.sum())
+            return labels
+        except Exception as e:
+            print(f"GPU clustering failed, falling back to CPU: {e}")
+    
+    if SKLEARN_AVAILABLE:
+        coords = np.radians(np.column_stack([latitude, longitude]))
+        labels = DBSCAN(
+            eps=eps_meters / EARTH_RADIUS_M,
+            min_samples=min_samples,
+            metric='haversine',
+            algorithm='ball_tree',
+            n_jobs=-1
+        ).fit_predict(coords)
+        
+        # Keep noise points as their own single-point hotspots
+        noise = labels == -1
+        labels[noise] = labels.max() + 1 + np.arange(noise.sum())
+        return labels
+    
+    # Grid fallback
+    return grid_cell_keys(latitude, longitude)
+
+def grid_cell_keys(latitude, longitude, resolution=0.1):
+    """
+    Compute one packed int32 grid-cell key per point.
+    
+    The latitude cell index goes in the high 16 bits and the longitude cell
+    index in the low 16 bits, so points share a key exactly when they fall in
+    the same cell. Valid for resolutions down to ~0.006 degrees.
+    
+    Args:
+        latitude: array of latitudes in degrees
+        longitude: array of longitudes in degrees
+        resolution: grid cell size in degrees
+        
+    Returns:
+        numpy int32 array of cell keys
+    """
+    lat_cell = np.floor(np.asarray(latitude) / resolution).astype(np.int32)
+    lon_cell = np.floor(np.asarray(longitude) / resolution).astype(np.int32)
+    return (lat_cell << 16) | (lon_cell & 0xFFFF)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _count_completion_buckets_jit(days_difference):
+        """Count early, on time and late completions in a single pass."""
+        counts = np.zeros(3, dtype=np.int64)
+        for days in days_difference:
+            if days <= -1:
+                counts[0] += 1
+            elif days <= 1:
+                counts[1] += 1
+            else:
+                counts[2] += 1
+        return counts
+
+def count_completion_buckets(days_difference):
+    """
+    Count completions that were early (a day or more before the expected date),
+    on time (up to a day after it) or late.
+    
+    Uses a Numba-compiled single-pass loop for large arrays when Numba is
+    installed, and np.searchsorted with np.bincount otherwise.
+    
+    Args:
+        days_difference: integer array of actual minus expected completion days
+        
+    Returns:
+        numpy array with the early, on time and late counts
+    """
+    days_difference = np.asarray(days_difference)
+    
+    if NUMBA_AVAILABLE and days_difference.size >= NUMBA_MIN_VALUES:
+        return _count_completion_buckets_jit(days_difference)
+    
+    # Bins are closed on the right: (-inf, -1], (-1, 1], (1, inf)
+    codes = np.searchsorted(np.array([-1, 1], dtype=days_difference.dtype), days_difference, side='left')
+    return np.bincount(codes, minlength=3)
@@ -6,11 +6,12 @@ import json
 import time
 import logging
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, JSON, Text, ForeignKey, func, distinct
+from sqlalchemy import create_engine, Column, Integer, Float, Numeric, String, DateTime, JSON, Text, ForeignKey, func, distinct, cast
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 import pandas as pd
 import sqlite3
+import streamlit as st
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -27,7 +28,12 @@ def get_database_engine():
         DATABASE_URL = os.environ.get('DATABASE_URL')
         if DATABASE_URL:
             try:
-                engine = create_engine(DATABASE_URL)
+                engine = create_engine(
+                    DATABASE_URL,
+                    pool_size=5,
+                    pool_pre_ping=True,
+                    pool_recycle=1800
+                )
                 # Test connection
                 with engine.connect() as conn:
                     conn.execute("SELECT 1")
@@ -42,8 +48,13 @@ def get_database_engine():
     logger.info("Using SQLite database")
     return create_engine(f"sqlite:///{sqlite_path}")
 
+@st.cache_resource(show_spinner=False)
+def get_engine():
+    """Get the shared database engine, created once per Streamlit process."""
+    return get_database_engine()
+
 # Create database connection
-engine = get_database_engine()
+engine = get_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -101,11 +112,30 @@ class ImageMetadata(Base):
     def __repr__(self):
         return f"ImageMetadata(id={self.id}, image_id={self.image_id})"
 
+class RepairRequest(Base):
+    """Model for storing road repair requests, one row per request"""
+    __tablename__ = "repair_requests"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    request_id = Column(String, nullable=False, unique=True, index=True)
+    status = Column(String)
+    data = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    def __repr__(self):
+        return f"RepairRequest(id={self.id}, request_id={self.request_id}, status={self.status})"
+
 # Create the tables
 def create_tables():
     """Create all database tables if they don't exist"""
     Base.metadata.create_all(bind=engine)
 
+@st.cache_resource(show_spinner=False)
+def ensure_schema():
+    """Create the database tables once per Streamlit process."""
+    create_tables()
+    return True
+
 # Get database session
 def get_db():
     """Get a database session"""
@@ -175,6 +205,67 @@ def save_detection_to_db(image_path, detections, metadata):
     finally:
         db.close()
 
+def save_detections_bulk(rows):
+    """
+    Save detection results for many images in a single transaction.
+    
+    Args:
+        rows (list): List of (image_path, detections, metadata) tuples
+        
+    Returns:
+        list: IDs of the saved images, in the order of the rows
+    """
+    if not rows:
+        return []
+    
+    db = get_db()
+    try:
+        # Create all image records, getting their IDs in one flush
+        images = [
+            Image(
+                filename=os.path.basename(image_path),
+                filepath=image_path,
+                width=metadata.get('image_width'),
+                height=metadata.get('image_height')
+            )
+            for image_path, _, metadata in rows
+        ]
+        db.add_all(images)
+        db.flush()
+        
+        # Create metadata and detection records
+        for image, (_, detections, metadata) in zip(images, rows):
+            db.add(ImageMetadata(
+                image_id=image.id,
+                latitude=metadata.get('latitude'),
+                longitude=metadata.get('longitude'),
+                inference_time=metadata.get('inference_time'),
+                model_name=metadata.get('model'),
+                metadata_json=metadata
+            ))
+            db.add_all([
+                Detection(
+                    image_id=image.id,
+                    class_id=det.get('class_id'),
+                    class_name=det.get('class_name'),
+                    confidence=det.get('confidence'),
+                    bbox_x1=det.get('bbox')[0],
+                    bbox_y1=det.get('bbox')[1],
+                    bbox_x2=det.get('bbox')[2],
+                    bbox_y2=det.get('bbox')[3]
+                )
+                for det in detections
+            ])
+        
+        db.commit()
+        return [image.id for image in images]
+    except Exception as e:
+        db.rollback()
+        print(f"Error saving to database: {e}")
+        return []
+    finally:
+        db.close()
+
 def get_all_detections():
     """
     Get all detections from the database.
@@ -329,7 +420,9 @@ def get_map_data():
                     'latitude': lat,
                     'longitude': lon,
                     'detection_count': count,
-                    'timestamp': datetime.now().timestamp()  # Placeholder
+                    'timestamp': datetime.now().timestamp(),  # Placeholder
+                    # Same layout as the file-based results, so both plot the same way
+                    'metadata': {'latitude': lat, 'longitude': lon}
                 })
             
             return results
@@ -340,5 +433,132 @@ def get_map_data():
     finally:
         db.close()
 
+def get_map_clusters(resolution=1):
+    """
+    Get geotagged detection counts aggregated on a rounded coordinate grid.
+    
+    Args:
+        resolution (int): Number of decimal places the coordinates are rounded to
+        
+    Returns:
+        list: List of dictionaries with cluster centroid, detection and image counts
+    """
+    db = get_db()
+    try:
+        try:
+            # Cast to NUMERIC so two-argument round() works on PostgreSQL as well
+            lat_bucket = func.round(cast(ImageMetadata.latitude, Numeric), resolution)
+            lon_bucket = func.round(cast(ImageMetadata.longitude, Numeric), resolution)
+            
+            query = db.query(
+                func.avg(ImageMetadata.latitude).label('latitude'),
+                func.avg(ImageMetadata.longitude).label('longitude'),
+                func.count(Detection.id).label('detection_count'),
+                func.count(distinct(Image.id)).label('image_count')
+            ).select_from(
+                Image
+            ).join(
+                Detection, Image.id == Detection.image_id
+            ).join(
+                ImageMetadata, Image.id == ImageMetadata.image_id
+            ).filter(
+                ImageMetadata.latitude.isnot(None),
+                ImageMetadata.longitude.isnot(None)
+            ).group_by(
+                lat_bucket,
+                lon_bucket
+            )
+            
+            return [
+                {
+                    'latitude': float(lat),
+                    'longitude': float(lon),
+                    'detection_count': detection_count,
+                    'image_count': image_count
+                }
+                for lat, lon, detection_count, image_count in query.all()
+            ]
+        except Exception as e:
+            logger.warning(f"Error getting map clusters from database: {e}")
+            return []
+    finally:
+        db.close()
+
+def get_repair_requests():
+    """
+    Get all stored repair requests in the order they were created.
+    
+    Returns:
+        list: List of repair request dictionaries
+    """
+    db = get_db()
+    try:
+        try:
+            return [data for (data,) in db.query(RepairRequest.data).order_by(RepairRequest.id).all()]
+        except Exception as e:
+            logger.warning(f"Error getting repair requests from database: {e}")
+            return []
+    finally:
+        db.close()
+
+def get_repair_requests_version():
+    """
+    Get a cheap fingerprint of the stored repair requests.
+    
+    Returns:
+        tuple: Number of stored requests and the time of the latest change, or None on error
+    """
+    db = get_db()
+    try:
+        try:
+            count, latest = db.query(func.count(RepairRequest.id), func.max(RepairRequest.updated_at)).one()
+            return (count, latest)
+        except Exception as e:
+            logger.warning(f"Error getting repair requests version from database: {e}")
+            return None
+    finally:
+        db.close()
+
+def save_repair_requests(requests):
+    """
+    Insert or update the given repair requests, touching only their rows.
+    
+    Args:
+        requests (list): Repair request dictionaries that are new or changed
+        
+    Returns:
+        bool: True if the requests were saved
+    """
+    db = get_db()
+    try:
+        now = datetime.now()
+        # Look up existing rows in batches to stay under SQLite's bound parameter limit
+        for start in range(0, len(requests), 500):
+            batch = requests[start:start + 500]
+            existing = {
+                row.request_id: row
+                for row in db.query(RepairRequest).filter(
+                    RepairRequest.request_id.in_([req['request_id'] for req in batch])
+                ).all()
+            }
+            for req in batch:
+                row = existing.get(req['request_id'])
+                if row is None:
+                    existing[req['request_id']] = RepairRequest(request_id=req['request_id'], status=req.get('status'), data=dict(req), updated_at=now)
+                    db.add(existing[req['request_id']])
+                else:
+                    # Assign a new dict so the JSON column is seen as changed
+                    row.status = req.get('status')
+                    row.data = dict(req)
+                    row.updated_at = now
+        db.commit()
+        return True
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error saving repair requests to database: {e}")
+        return False
+    finally:
+        db.close()
+
 # Initialize database
-create_tables()
\ No newline at end of file
+ensure_schema()
\ No newline at end of file
@@ -9,6 +9,7 @@ import io
 import base64
 from PIL import Image
 import random
+import streamlit as st
 from utils.database import save_detection_to_db
 
 class PotholeDetector:
@@ -22,6 +23,9 @@ class PotholeDetector:
         """
         # Class names
         self.class_names = {0: 'pothole'}
+        
+        # Longest image side the model works on, the YOLOv8 default
+        self.input_size = 640
         print(f"Initialized PotholeDetector (Simulation Mode)")
         
         # Create data directories if they don't exist
@@ -29,20 +33,27 @@ class PotholeDetector:
         os.makedirs("data/processed", exist_ok=True)
         os.makedirs("data/results", exist_ok=True)
         
-    def detect_potholes(self, image_path, conf_threshold=0.25):
+    def detect_potholes(self, image_path, conf_threshold=0.25, imgsz=None):
         """
         Detect potholes in the given image (simulated).
         
         Args:
-            image_path (str): Path to the input image
+            image_path (str, file-like or np.ndarray): Path to the input image, an in-memory
+                image file, or an already decoded image array (RGB, or BGR straight from
+                OpenCV; the processed image keeps the array's channel order)
             conf_threshold (float): Confidence threshold for detection
+            imgsz (int, optional): Longest side the image is shrunk to before inference;
+                boxes are mapped back onto the full resolution image
             
         Returns:
             tuple: (processed_image, detections, metadata)
         """
         try:
             # Load image
-            if isinstance(image_path, str):
+            if isinstance(image_path, np.ndarray):
+                # Already decoded by the caller, so skip a second decode
+                image_rgb = image_path
+            elif isinstance(image_path, str):
                 image = cv2.imread(image_path)
                 image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             else:
@@ -51,60 +62,165 @@ class PotholeDetector:
                 image_rgb = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
                 image = image_rgb
 
-            # Get image dimensions
-            height, width = image_rgb.shape[:2]
+            # Shrink to the model input size
+            model_input, scale = self._resize_for_inference(image_rgb, imgsz)
+            height, width = model_input.shape[:2]
             
             # Simulate inference time
             start_time = time.time()
             time.sleep(0.5)  # Simulate detection delay
             inference_time = time.time() - start_time
             
-            # Generate random detections for demonstration
-            detections = []
-            num_detections = random.randint(0, 4)  # Random number of "potholes"
+            detections, metadata = self._simulate_detections(width, height, conf_threshold, inference_time)
+            if scale < 1:
+                self._rescale_detections(detections, metadata, image_rgb.shape, scale)
             
-            for i in range(num_detections):
-                # Create random bounding box
-                box_w = random.randint(width // 10, width // 3)
-                box_h = random.randint(height // 10, height // 3)
-                x1 = random.randint(0, width - box_w)
-                y1 = random.randint(0, height - box_h)
-                x2 = x1 + box_w
-                y2 = y1 + box_h
-                
-                # Random confidence score higher than threshold
-                conf = random.uniform(max(0.3, conf_threshold), 0.95)
-                
-                detection = {
-                    'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                    'confidence': float(conf),
-                    'class_id': 0,
-                    'class_name': 'pothole'
-                }
-                detections.append(detection)
+            return image_rgb, detections, metadata
+            
+        except Exception as e:
+            print(f"Error in detection: {e}")
+            return None, [], {'error': str(e)}
+    
+    def _resize_for_inference(self, image, imgsz):
+        """
+        Shrink an image so its longest side is at most imgsz, keeping the aspect ratio.
+        
+        Args:
+            image (np.ndarray): Image array
+            imgsz (int or None): Longest side in pixels, None to keep the image as-is
+            
+        Returns:
+            tuple: (resized_image, scale)
+        """
+        height, width = image.shape[:2]
+        if not imgsz or max(height, width) <= imgsz:
+            return image, 1.0
+        
+        # Area averaging for big reductions, bilinear is close enough and faster otherwise
+        scale = imgsz / max(height, width)
+        resized = cv2.resize(
+            image,
+            (round(width * scale), round(height * scale)),
+            interpolation=cv2.INTER_AREA if scale < 0.5 else cv2.INTER_LINEAR
+        )
+        return resized, scale
+    
+    def _rescale_detections(self, detections, metadata, image_shape, scale):
+        """
+        Map detections made on a shrunk image back onto the original image, in place.
+        
+        Args:
+            detections (list): List of detection dictionaries
+            metadata (dict): Detection metadata
+            image_shape (tuple): Shape of the original image
+            scale (float): Factor the image was shrunk by
+        """
+        height, width = image_shape[:2]
+        if detections:
+            bboxes = np.rint(np.array([det['bbox'] for det in detections]) / scale).astype(int)
+            bboxes[:, [0, 2]] = bboxes[:, [0, 2]].clip(0, width)
+            bboxes[:, [1, 3]] = bboxes[:, [1, 3]].clip(0, height)
+            for det, bbox in zip(detections, bboxes.tolist()):
+                det['bbox'] = bbox
+        metadata['image_width'] = width
+        metadata['image_height'] = height
+    
+    def _simulate_detections(self, width, height, conf_threshold, inference_time):
+        """
+        Generate random detections and metadata for one image (simulated model output).
+        
+        Args:
+            width (int): Image width in pixels
+            height (int): Image height in pixels
+            conf_threshold (float): Confidence threshold for detection
+            inference_time (float): Inference time to report for the image
             
-            # Create metadata
-            metadata = {
-                'image_width': width,
-                'image_height': height,
-                'inference_time': inference_time,
-                'detection_count': len(detections),
-                'model': "YOLOv8 (Simulation)",
-                'timestamp': time.time()
+        Returns:
+            tuple: (detections, metadata)
+        """
+        # Generate random detections for demonstration
+        detections = []
+        num_detections = random.randint(0, 4)  # Random number of "potholes"
+        
+        for i in range(num_detections):
+            # Create random bounding box
+            box_w = random.randint(width // 10, width // 3)
+            box_h = random.randint(height // 10, height // 3)
+            x1 = random.randint(0, width - box_w)
+            y1 = random.randint(0, height - box_h)
+            x2 = x1 + box_w
+            y2 = y1 + box_h
+            
+            # Random confidence score higher than threshold
+            conf = random.uniform(max(0.3, conf_threshold), 0.95)
+            
+            detection = {
+                'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                'confidence': float(conf),
+                'class_id': 0,
+                'class_name': 'pothole'
             }
+            detections.append(detection)
+        
+        # Create metadata
+        metadata = {
+            'image_width': width,
+            'image_height': height,
+            'inference_time': inference_time,
+            'detection_count': len(detections),
+            'model': "YOLOv8 (Simulation)",
+            'timestamp': time.time()
+        }
+        
+        # Add random geo coordinates for map demonstration
+        if random.random() > 0.3:  # 70% chance to have geo data
+            metadata['latitude'] = random.uniform(40.6, 40.8)  # NYC area
+            metadata['longitude'] = random.uniform(-74.1, -73.9)
+        
+        return detections, metadata
+    
+    def detect_potholes_batch(self, frames, conf_threshold=0.25, imgsz=None):
+        """
+        Detect potholes in a batch of already decoded frames (simulated).
+        
+        The whole batch goes through a single simulated forward pass, so the
+        fixed per-call cost is paid once per batch rather than once per frame.
+        
+        Args:
+            frames (list): List of image arrays, RGB or BGR; processed images keep their channel order
+            conf_threshold (float): Confidence threshold for detection
+            imgsz (int, optional): Longest side frames are shrunk to before inference;
+                boxes are mapped back onto the full resolution frames
             
-            # Add random geo coordinates for map demonstration
-            if random.random() > 0.3:  # 70% chance to have geo data
-                metadata['latitude'] = random.uniform(40.6, 40.8)  # NYC area
-                metadata['longitude'] = random.uniform(-74.1, -73.9)
+        Returns:
+            list: One (processed_image, detections, metadata) tuple per frame
+        """
+        if not frames:
+            return []
+        
+        try:
+            # Shrink to the model input size
+            resized = [self._resize_for_inference(frame, imgsz) for frame in frames]
             
-            return image_rgb, detections, metadata
+            # Simulate inference time for the batch
+            start_time = time.time()
+            time.sleep(0.5)  # Simulate detection delay
+            inference_time = (time.time() - start_time) / len(frames)
+            
+            results = []
+            for frame, (model_input, scale) in zip(frames, resized):
+                height, width = model_input.shape[:2]
+                detections, metadata = self._simulate_detections(width, height, conf_threshold, inference_time)
+                if scale < 1:
+                    self._rescale_detections(detections, metadata, frame.shape, scale)
+                results.append((frame, detections, metadata))
+            return results
             
         except Exception as e:
-            print(f"Error in detection: {e}")
-            return None, [], {'error': str(e)}
+            print(f"Error in batch detection: {e}")
+            return [(None, [], {'error': str(e)}) for _ in frames]
     
-    def save_results(self, image, detections, metadata, original_filename, output_dir="data/results"):
+    def save_results(self, image, detections, metadata, original_filename, output_dir="data/results", encoded_image=None):
         """
         Save detection results (image with bounding boxes and detection data).
         
@@ -114,6 +230,7 @@ class PotholeDetector:
             metadata (dict): Detection metadata
             original_filename (str): Original image filename
             output_dir (str): Directory to save results
+            encoded_image (bytes, optional): The image already encoded as JPEG, written as-is
             
         Returns:
             tuple: (image_path, json_path)
@@ -129,7 +246,11 @@ class PotholeDetector:
         
         # Save the image
         image_path = os.path.join(output_dir, image_filename)
-        cv2.imwrite(image_path, cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+        if encoded_image is not None:
+            with open(image_path, 'wb') as f:
+                f.write(encoded_image)
+        else:
+            cv2.imwrite(image_path, cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
         
         # Save detection results as JSON
         result_data = {
@@ -210,3 +331,8 @@ class PotholeDetector:
         
         buffer.seek(0)
         return buffer, mime_type, file_ext
+
+@st.cache_resource(show_spinner=False)
+def get_detector():
+    """Get the shared detector, created once per Streamlit process and reused by every page and session."""
+    return PotholeDetector()
@@ -0,0 +1,200 @@
+"""
+Static content for the user manual page.
+"""
+import functools
+import html
+import re
+from pathlib import Path
+import streamlit as st
+
+# Markdown for the manual sections, one <!--SECTION:key--> block per section
+SECTIONS_PATH = Path(__file__).with_name("manual_content.md")
+
+# Feature guide entries as (page title, intro sentence, [(label, description), ...])
+FEATURE_GUIDE = [
+    ("Upload & Detect", "This page allows you to upload images for pothole detection:", [
+        ("Upload Image", "Select an image file from your computer"),
+        ("Use Sample", "Alternatively, use one of the provided sample images"),
+        ("Adjust Parameters", "Set the confidence threshold for detection"),
+        ("View Results", "See the processed image with detected potholes"),
+        ("Export Results", "Export detection results in various formats")
+    ]),
+    ("Gallery", "The Gallery page displays all previously processed images:", [
+        ("Browse Images", "View all processed images with detection results"),
+        ("Filter Options", "Filter images by date, confidence level, etc."),
+        ("Sort Options", "Sort images by different criteria"),
+        ("Image Details", "Click on an image to see detailed detection information")
+    ]),
+    ("Dashboard", "The Dashboard provides analytics and insights about pothole detections:", [
+        ("Overview Metrics", "See key statistics about pothole detections"),
+        ("Charts and Graphs", "Visualize detection patterns and trends"),
+        ("Time-based Analysis", "Analyze detections over time"),
+        ("Export Reports", "Download reports and data exports")
+    ]),
+    ("Map", "The Map page visualizes pothole locations geographically:", [
+        ("Interactive Map", "View detected potholes on a geographical map"),
+        ("Hotspots", "Identify areas with high pothole concentrations"),
+        ("Filters", "Filter map data by date, severity, etc."),
+        ("Location Details", "Click on map markers for detailed information")
+    ]),
+    ("Database", "The Database page allows you to manage detection records:", [
+        ("View Records", "Browse all detection records in the database"),
+        ("Search and Filter", "Find specific records based on criteria"),
+        ("Database Info", "View information about the database configuration"),
+        ("Export Data", "Export database records in various formats")
+    ]),
+    ("Batch Processing", "The Batch Processing page allows you to process multiple images at once:", [
+        ("Select Folder", "Choose a folder containing multiple images"),
+        ("Processing Settings", "Configure batch processing parameters"),
+        ("Batch Results", "View results of the batch processing operation"),
+        ("Export Options", "Export batch results in various formats")
+    ]),
+    ("Video Processing", "The Video Processing page allows you to analyze videos for potholes:", [
+        ("Upload Video", "Upload a video file for processing"),
+        ("Use Demo Video", "Use a sample video for demonstration"),
+        ("Webcam Feed", "Use a webcam for real-time pothole detection"),
+        ("Processing Options", "Configure video processing parameters"),
+        ("Results Viewer", "View frame-by-frame detection results")
+    ]),
+    ("Alerts & Reporting", "The Alerts & Reporting page allows you to set up alerts and generate reports:", [
+        ("Alert Setup", "Configure alert thresholds and notification methods"),
+        ("Critical Areas", "View and manage critical pothole areas"),
+        ("Report Generation", "Create comprehensive reports about pothole detections"),
+        ("Detective Pothole", "Interact with the helpful mascot for guidance")
+    ]),
+    ("Road Repair Requests", "The Road Repair Requests page allows you to submit and track repair requests:", [
+        ("Create Request", "Submit a repair request for a detected pothole"),
+        ("Track Requests", "Monitor the status of submitted repair requests"),
+        ("Update Status", "Update the status of repair requests"),
+        ("Analytics", "View statistics and insights about repair requests")
+    ]),
+]
+
+def _render_feature(title, intro, bullets):
+    """Format one feature guide entry as markdown."""
+    return f"#### {title}\n\n{intro}\n\n" + "\n".join(f"- **{label}**: {text}" for label, text in bullets)
+
+# Joined once at import; load_sections() slots it in as the feature_guide section
+_FEATURE_MD = "### Feature Guide\n\n" + "\n\n".join(_render_feature(*entry) for entry in FEATURE_GUIDE)
+
+# Frequently asked questions shown at the bottom of the manual, as (question, answer) pairs
+FAQ_ITEMS = (
+    (
+        "How accurate is the pothole detection?",
+        "The pothole detection model achieves about 89% precision and 86% recall on our validation dataset. This means it correctly identifies most potholes while maintaining a low rate of false positives. Performance may vary depending on image quality and lighting conditions."
+    ),
+    (
+        "Can I use my own pothole images?",
+        "Yes! You can upload your own images through the 'Upload & Detect' page. The system supports JPG, JPEG, and PNG image formats."
+    ),
+    (
+        "Does the system work with video?",
+        "Yes, the 'Video Processing' page allows you to upload video files or use a webcam feed for real-time pothole detection."
+    ),
+    (
+        "How are repair requests handled?",
+        "The 'Road Repair Requests' page allows you to submit repair requests for detected potholes. You can track the status of these requests and receive updates as they progress through the repair workflow."
+    ),
+    (
+        "Do I need an internet connection?",
+        "The application can run locally without an internet connection. However, some features like map visualization and SMS alerts require internet connectivity."
+    ),
+    (
+        "Can I export detection results?",
+        "Yes, you can export detection results in various formats including CSV, JSON, and Excel from several pages in the application."
+    ),
+    (
+        "How do I set up SMS alerts?",
+        "To enable SMS alerts, you need to configure Twilio credentials (Account SID, Auth Token, and Phone Number) in the application. Once configured, you can set up alerts in the 'Alerts & Reporting' page."
+    ),
+    (
+        "What database does the system use?",
+        "The system primarily uses PostgreSQL for database storage. However, it will automatically fall back to SQLite if PostgreSQL is not available, ensuring the application works in various environments."
+    ),
+    (
+        "Can the system detect potholes at night?",
+        "The detection accuracy may be reduced in low-light conditions. For best results, use well-lit images or apply appropriate image enhancement techniques before processing."
+    ),
+    (
+        "How do I add more sample images?",
+        "You can add sample images to the 'data/sample_images' directory. These will automatically appear in the application for demonstration purposes."
+    ),
+)
+
+# Detective Pothole mascot shown in the corner of the manual page
+MASCOT_HTML = """
+<style>
+@keyframes bounce {
+    0%, 20%, 50%, 80%, 100% {transform: translateY(0);}
+    40% {transform: translateY(-30px);}
+    60% {transform: translateY(-15px);}
+}
+
+@keyframes float {
+    0% {transform: translateY(0px) rotate(0deg);}
+    50% {transform: translateY(-10px) rotate(5deg);}
+    100% {transform: translateY(0px) rotate(0deg);}
+}
+
+.mascot-container {
+    position: fixed;
+    bottom: 20px;
+    right: 20px;
+    z-index: 1000;
+    animation: float 3s ease-in-out infinite;
+    text-align: center;
+}
+
+.mascot-bounce {
+    animation: bounce 2s ease infinite;
+}
+
+.mascot-speech {
+    background-color: white;
+    border: 2px solid #4b79ff;
+    border-radius: 10px;
+    padding: 10px;
+    margin-bottom: 10px;
+    max-width: 200px;
+    position: relative;
+}
+
+.mascot-speech:after {
+    content: '';
+    position: absolute;
+    bottom: -10px;
+    right: 20px;
+    border-width: 10px 10px 0;
+    border-style: solid;
+    border-color: #4b79ff transparent;
+}
+</style>
+
+<div class="mascot-container">
+    <div class="mascot-speech">Need help understanding the app? I've compiled this comprehensive manual for you!</div>
+    <div class="mascot-bounce">🕵️</div>
+</div>
+"""
+
+@st.cache_resource(show_spinner=False)
+def load_sections():
+    """Read and split the manual sections once per Streamlit process."""
+    raw = SECTIONS_PATH.read_text(encoding="utf-8")
+    sections = {
+        key: text.strip()
+        for key, text in re.findall(r"<!--SECTION:(\w+)-->\n(.*?)(?=<!--SECTION:|\Z)", raw, re.S)
+    }
+    sections["feature_guide"] = _FEATURE_MD
+    return sections
+
+@functools.lru_cache(maxsize=1)
+def build_faq_html(items):
+    """Build the FAQ list as a single block of <details> elements."""
+    return "".join(
+        f"<details><summary>Q: {html.escape(question)}</summary>"
+        f"<p><strong>A:</strong> {html.escape(answer)}</p></details>"
+        for question, answer in items
+    )
+
+# Escaped once at import so page reruns only reference the finished HTML
+FAQ_HTML = build_faq_html(FAQ_ITEMS)
@@ -9,6 +9,7 @@ from PIL import Image, ImageDraw, ImageFont
 import io
 import random
 import colorsys
+from utils.data_processing import grid_cell_keys
 
 def draw_bounding_boxes(image, detections, min_confidence=0.3):
     """
@@ -262,6 +263,32 @@ def create_detection_summary_chart(results_data):
     
     return fig
 
+def get_map_points(detection_data):
+    """
+    Extract the plottable points from detection results.
+    
+    Args:
+        detection_data: list of dictionaries with geotagged detection data
+        
+    Returns:
+        tuple of (latitude, longitude, count, filename) tuples, hashable so it
+        can be used as a cache key
+    """
+    points = []
+    for item in detection_data:
+        metadata = item.get('metadata', {})
+        if 'latitude' in metadata and 'longitude' in metadata:
+            # Database rows carry a count instead of the detection list
+            count = item['detection_count'] if 'detection_count' in item else len(item.get('detections', []))
+            if count > 0:
+                points.append((
+                    float(metadata['latitude']),
+                    float(metadata['longitude']),
+                    count,
+                    item.get('filename', 'Unknown')
+                ))
+    return tuple(points)
+
 def create_pothole_map(detection_data, default_lat=40.7128, default_lon=-74.0060):
     """
     Create a map visualization of pothole locations.
@@ -274,50 +301,82 @@ def create_pothole_map(detection_data, default_lat=40.7128, default_lon=-74.0060
     Returns:
         plotly figure object
     """
-    # Filter valid data with coordinates
-    valid_data = []
-    for item in detection_data:
-        metadata = item.get('metadata', {})
-        if 'latitude' in metadata and 'longitude' in metadata:
-            lat = metadata['latitude']
-            lon = metadata['longitude']
-            count = len(item.get('detections', []))
-            if count > 0:
-                valid_data.append({
-                    'latitude': lat,
-                    'longitude': lon,
-                    'count': count,
-                    'filename': item.get('filename', 'Unknown'),
-                    'timestamp': item.get('timestamp', 0)
-                })
+    return create_map_from_points(get_map_points(detection_data), default_lat, default_lon)
+
+# Above this many points the map shows grid clusters instead of individual markers
+MAP_CLUSTER_THRESHOLD = 500
+
+def cluster_map_points(points_df, resolution=0.1):
+    """
+    Aggregate map points into a lat/lon grid.
     
-    # Create DataFrame
-    if valid_data:
-        df = pd.DataFrame(valid_data)
+    Args:
+        points_df: DataFrame with latitude, longitude and count columns
+        resolution: grid cell size in degrees
         
-        # Create map
-        fig = px.scatter_mapbox(
-            df,
-            lat='latitude',
-            lon='longitude',
-            size='count',
-            color='count',
-            hover_name='filename',
-            hover_data={
-                'count': True,
-                'timestamp': False,
-                'latitude': False,
-                'longitude': False
-            },
-            color_continuous_scale=px.colors.sequential.Reds,
-            size_max=15,
-            zoom=10,
-            title='Pothole Detection Map'
-        )
+    Returns:
+        DataFrame with one row per non-empty cell: mean latitude/longitude,
+        summed count and a label with the number of images
+    """
+    cell_keys = grid_cell_keys(points_df['latitude'].to_numpy(), points_df['longitude'].to_numpy(), resolution)
+    clusters = points_df.groupby(cell_keys).agg(
+        latitude=('latitude', 'mean'),
+        longitude=('longitude', 'mean'),
+        count=('count', 'sum'),
+        images=('count', 'size')
+    ).reset_index(drop=True)
+    clusters['filename'] = clusters['images'].astype(str) + " images"
+    return clusters
+
+def create_map_from_points(points, default_lat=40.7128, default_lon=-74.0060):
+    """
+    Create a map visualization from extracted map points.
+    
+    Args:
+        points: sequence of (latitude, longitude, count, filename) tuples
+        default_lat: default latitude if no data available
+        default_lon: default longitude if no data available
+        
+    Returns:
+        plotly figure object
+    """
+    if points:
+        # Create DataFrame
+        df = pd.DataFrame(list(points), columns=['latitude', 'longitude', 'count', 'filename'])
+        
+        if len(df) > MAP_CLUSTER_THRESHOLD:
+            # Too many points to draw individually, plot grid cluster centroids instead
+            plot_df = cluster_map_points(df)
+            title = 'Pothole Detection Map (Clustered)'
+        else:
+            plot_df = df
+            title = 'Pothole Detection Map'
+        
+        # One WebGL trace for all markers, sized and coloured by detection count
+        fig = go.Figure(go.Scattermapbox(
+            lat=plot_df['latitude'],
+            lon=plot_df['longitude'],
+            mode='markers',
+            marker=go.scattermapbox.Marker(
+                size=plot_df['count'],
+                sizemode='area',
+                sizeref=2.0 * plot_df['count'].max() / (15 ** 2),
+                color=plot_df['count'],
+                colorscale='Reds',
+                showscale=True
+            ),
+            text=plot_df['filename'],
+            hovertemplate='%{text}<br>count=%{marker.color}<extra></extra>'
+        ))
         
         fig.update_layout(
-            mapbox_style="open-street-map",
-            margin={"r": 0, "t": 30, "l": 0, "b": 0}
+            mapbox={
+                'style': "open-street-map",
+                'center': {'lat': df['latitude'].mean(), 'lon': df['longitude'].mean()},
+                'zoom': 10
+            },
+            margin={"r": 0, "t": 30, "l": 0, "b": 0},
+            title=title
         )
     else:
         # Return empty map centered at default location